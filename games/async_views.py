@@ -0,0 +1,62 @@
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework import status
+
+from .cache import games_list_cache
+from .catalog import catalog_etag, catalog_last_modified
+from .models import Game
+from .pagination import GamePagination, GameCursorPagination
+from .serializers import CreateGameSerializer, GameValuesSerializer
+from .views import filter_games
+from utils.async_views import AsyncAPIView, json_response
+from utils.instrumentation import timed
+
+
+class AsyncGamesApi(AsyncAPIView):
+
+    @method_decorator(condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified))
+    async def get(self, request):
+        try:
+            cache_key = games_list_cache.key(request)
+            if (data := games_list_cache.get(cache_key)) is not None:
+                return json_response(data)
+
+            games = filter_games(Game.objects.all(), request.query_params)
+            fields = GameValuesSerializer.select(request.query_params)
+
+            if GameCursorPagination.is_requested(request):
+                paginator = GameCursorPagination()
+                extra = paginator.key_fields()
+            else:
+                # without an order the index chosen for the ?fields= projection decides what is on a page
+                paginator = GamePagination()
+                games, extra = games.order_by('id'), ()
+            result_page = await paginator.apaginate_queryset(GameValuesSerializer.values(games, fields, extra), request)
+            with timed('serialize'):
+                data = paginator.get_paginated_response(GameValuesSerializer.prune(result_page, fields)).data
+            response = json_response(data)
+            games_list_cache.set(cache_key, data, len(response.content))
+            return response
+        except ValueError as e:
+            return json_response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+    async def post(self, request):
+        serializer = CreateGameSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.instance = await Game.objects.acreate(**serializer.validated_data)
+            return json_response(serializer.data, status=status.HTTP_201_CREATED)
+        return json_response({'message': 'wrong input data'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncGameApi(AsyncAPIView):
+
+    @method_decorator(condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified))
+    async def get(self, request, id):
+        try:
+            fields = GameValuesSerializer.select(request.query_params)
+            game = await GameValuesSerializer.values(Game.objects.all(), fields).aget(pk=id)
+            return json_response(game)
+        except Game.DoesNotExist:
+            return json_response({'message': f'game with the id {id} does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return json_response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
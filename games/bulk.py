@@ -0,0 +1,40 @@
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .catalog import bump_catalog_version
+from .facets import apply_facet_deltas, facet_deltas
+from .models import Game
+from .serializers import CreateGameSerializer
+from utils.streaming import ImportReport, chunked
+
+
+def ingest_games(records, chunk_size=1000, max_reported_errors=1000):
+    """
+    Validate (row_number, value, error) records chunk by chunk and insert the
+    valid rows with bulk_create, one transaction per chunk. Only the current
+    chunk and at most max_reported_errors error entries are held in memory.
+    """
+    report = ImportReport(max_reported_errors, created=0)
+
+    serializer = CreateGameSerializer()
+    for chunk in chunked(report.guarded(records), chunk_size):
+        games = []
+        for row, value, error in chunk:
+            if error is not None:
+                report.add_error(row, {'non_field_errors': [error]})
+                continue
+            if not isinstance(value, dict):
+                report.add_error(row, {'non_field_errors': ['expected a JSON object']})
+                continue
+            try:
+                games.append(Game(**serializer.run_validation(value)))
+            except ValidationError as e:
+                report.add_error(row, e.detail)
+        if games:
+            with transaction.atomic():
+                Game.objects.bulk_create(games, batch_size=chunk_size)
+                apply_facet_deltas(facet_deltas(added=games))
+            # bulk_create sends no post_save signals
+            bump_catalog_version()
+            report['created'] += len(games)
+    return report
@@ -0,0 +1,60 @@
+import hashlib
+import threading
+
+from django.conf import settings
+
+from .catalog import get_catalog_version, get_games_cache, normalized_query
+from utils.replicas import reading_from_replicas
+
+
+class ResponseCache:
+    """
+    Caches serialized GamesApi.get payloads under the catalog version, so any
+    write to Game makes every older entry unreachable without a TTL sweep.
+    bytes_written counts the rendered size of every payload stored, entries
+    dropped or expired since are not subtracted.
+    """
+
+    def __init__(self, prefix, timeout=3600):
+        self.prefix = prefix
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+
+    def key(self, request):
+        query = f'{request.get_host()}|{request.path}|{normalized_query(request)}'
+        digest = hashlib.sha1(query.encode()).hexdigest()
+        return f"{self.prefix}:{get_catalog_version()['version']}:{digest}"
+
+    def get(self, key):
+        data = get_games_cache().get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, key, data, size):
+        """Store data, size being the length of its rendered response."""
+        # payloads read from a lagging replica would be served as the current version to everyone
+        if reading_from_replicas():
+            return
+        get_games_cache().set(key, data, timeout=self.timeout)
+        with self._lock:
+            self.bytes_written += size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'bytes_written': self.bytes_written,
+            }
+
+
+games_list_cache = ResponseCache('games:list', getattr(settings, 'GAMES_RESPONSE_CACHE_TIMEOUT', 3600))
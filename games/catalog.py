@@ -0,0 +1,71 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from utils.replicas import reading_from_replicas
+
+CATALOG_VERSION_KEY = 'games:catalog:version'
+
+
+def get_games_cache():
+    return caches[getattr(settings, 'GAMES_CACHE_ALIAS', 'default')]
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_catalog_cache(app_configs, **kwargs):
+    # a bump in one worker must reach the others, or they keep answering 304 and cached pages until the timeout
+    if isinstance(get_games_cache(), LocMemCache):
+        return [checks.Warning(
+            'GAMES_CACHE_ALIAS is a per-process cache: a catalog write only changes the ETags and '
+            'cached listings of the worker that made it.',
+            hint="Run a single worker, or set CACHE_DIR (file based cache) or point GAMES_CACHE_ALIAS at a shared backend.",
+            id='games.W001',
+        )]
+    return []
+
+
+def _new_version():
+    now = time.time_ns()
+    return {'version': f'{now:x}', 'modified': now / 1e9}
+
+
+def get_catalog_version():
+    """
+    Current catalog version as {'version': str, 'modified': timestamp}, kept in
+    the cache so it can be read without touching the database. When the entry
+    is missing (cold cache) a fresh version is published, which only costs
+    clients one full response.
+    """
+    cache = get_games_cache()
+    current = cache.get(CATALOG_VERSION_KEY)
+    if current is None:
+        cache.add(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+        current = cache.get(CATALOG_VERSION_KEY) or _new_version()
+    return current
+
+
+def bump_catalog_version():
+    get_games_cache().set(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+
+
+def normalized_query(request):
+    return '&'.join(f'{key}={value}' for key, value in sorted(request.GET.lists()))
+
+
+def catalog_etag(request, *args, **kwargs):
+    # a replica may lag behind the version, so replica reads get no validators (and no 304s)
+    if reading_from_replicas():
+        return None
+    key = f"{get_catalog_version()['version']}|{request.path}|{normalized_query(request)}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    if reading_from_replicas():
+        return None
+    return datetime.fromtimestamp(get_catalog_version()['modified'], tz=timezone.utc)
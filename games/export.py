@@ -0,0 +1,35 @@
+import csv
+import json
+
+EXPORT_FIELDS = ('id', 'name', 'year_released', 'genre', 'studio')
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the written line back to the csv writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(games, chunk_size=EXPORT_CHUNK_SIZE):
+    # values_list + iterator streams tuples chunk by chunk without building model instances or caching them
+    return games.order_by('id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n'
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', iter_ndjson),
+    'csv': ('text/csv', iter_csv),
+}
@@ -0,0 +1,81 @@
+from collections import Counter
+
+from django.db import connections, transaction
+from django.db.models import Count, F, Q
+
+from .models import Game, GameFacet
+
+FACET_FIELDS = ('genre', 'year_released', 'studio')
+
+
+def facet_keys(game):
+    """(dimension, value) pairs of a Game instance or a values() row."""
+    get = game.get if isinstance(game, dict) else lambda field: getattr(game, field)
+    return [(field, str(get(field))) for field in FACET_FIELDS]
+
+
+def facet_deltas(added=(), removed=()):
+    deltas = Counter()
+    for game in added:
+        deltas.update(facet_keys(game))
+    for game in removed:
+        deltas.subtract(facet_keys(game))
+    return deltas
+
+
+def apply_facet_deltas(deltas, using='default'):
+    """
+    Add the per-(dimension, value) deltas to the facet counts with one upsert
+    and drop the values whose count fell to zero. Unchanged keys are skipped,
+    so updating a game without touching its facet fields writes nothing.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor in ('sqlite', 'postgresql'):
+            qn = connection.ops.quote_name
+            table = qn(GameFacet._meta.db_table)
+            sql = (
+                f'INSERT INTO {table} ({qn("dimension")}, {qn("value")}, {qn("count")}) '
+                f'VALUES {", ".join(["(%s, %s, %s)"] * len(deltas))} '
+                f'ON CONFLICT ({qn("dimension")}, {qn("value")}) '
+                f'DO UPDATE SET {qn("count")} = {table}.{qn("count")} + excluded.{qn("count")}'
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [param for (dimension, value), delta in deltas.items() for param in (dimension, value, delta)])
+        else:
+            for (dimension, value), delta in deltas.items():
+                facets = GameFacet.objects.using(using).filter(dimension=dimension, value=value)
+                if not facets.update(count=F('count') + delta):
+                    GameFacet.objects.using(using).create(dimension=dimension, value=value, count=delta)
+        decreased = [Q(dimension=dimension, value=value) for (dimension, value), delta in deltas.items() if delta < 0]
+        if decreased:
+            condition = Q()
+            for key in decreased:
+                condition |= key
+            GameFacet.objects.using(using).filter(condition, count__lte=0).delete()
+
+
+def rebuild_facets(using='default'):
+    """Recompute every facet count from Game with one GROUP BY per dimension."""
+    with transaction.atomic(using=using):
+        GameFacet.objects.using(using).all().delete()
+        for field in FACET_FIELDS:
+            rows = Game.objects.using(using).order_by().values(field).annotate(total=Count('id'))
+            GameFacet.objects.using(using).bulk_create(
+                (GameFacet(dimension=field, value=str(row[field]), count=row['total']) for row in rows.iterator()),
+                batch_size=1000
+            )
+
+
+def get_facets(dimensions=FACET_FIELDS, limit=None):
+    """{dimension: [{'value': ..., 'count': ...}]} ordered by count, values typed like the Game field."""
+    facets = {dimension: [] for dimension in dimensions}
+    rows = GameFacet.objects.filter(dimension__in=dimensions, count__gt=0).order_by('dimension', '-count', 'value')
+    for dimension, value, count in rows.values_list('dimension', 'value', 'count'):
+        values = facets[dimension]
+        if limit is None or len(values) < limit:
+            values.append({'value': Game._meta.get_field(dimension).to_python(value), 'count': count})
+    return facets
@@ -0,0 +1,130 @@
+"""
+Deterministic synthetic catalog: games with skewed genre/year/studio
+distributions, users and power-law favorites, written with executemany in
+batches so tens of millions of rows stay practical.
+"""
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from .catalog import bump_catalog_version
+from .facets import rebuild_facets
+from .models import Game
+from .search import drop_search_triggers, is_supported, rebuild_search_index
+from users.models import Favorites, User
+
+# roughly the shape of a real store catalog: a few dominant genres and a long tail
+GENRE_WEIGHTS = {
+    'RPG': 18, 'action': 16, 'przygodowe': 12, 'strategia': 10, 'FPS': 8, 'sportowa': 7,
+    'platformowa': 6, 'wyścigi': 6, 'symulacja': 5, 'logiczna': 4, 'action RPG': 3,
+    'bijatyka': 2, 'MMO': 2, 'survival': 1,
+}
+NAME_WORDS = (
+    'Dark', 'Lost', 'Eternal', 'Iron', 'Crimson', 'Shadow', 'Star', 'Ancient', 'Silent', 'Wild',
+    'Kingdom', 'Legends', 'Empire', 'Quest', 'Frontier', 'Tales', 'Storm', 'Realm', 'Odyssey', 'Chronicles',
+)
+FIRST_YEAR, LAST_YEAR = 1980, 2025
+PASSWORD = 'catalog-password'
+USERNAME_PREFIX = 'catalog'
+
+
+def games_for(count, seed):
+    """Yield (name, year_released, genre, studio) tuples; the same seed always gives the same rows."""
+    rng = random.Random(seed)
+    genres, weights = list(GENRE_WEIGHTS), list(GENRE_WEIGHTS.values())
+    studios = max(10, min(count // 40, 50000))
+    for number in range(count):
+        # most releases are recent, studio sizes follow a power law
+        year = min(LAST_YEAR, int(rng.triangular(FIRST_YEAR, LAST_YEAR + 1, LAST_YEAR - 3)))
+        studio = int(studios * rng.random() ** 2.5)
+        name = f'{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {number}'
+        yield name, year, rng.choices(genres, weights)[0], f'Studio {studio}'
+
+
+def insert_rows(table, columns, rows, batch_size):
+    qn = connection.ops.quote_name
+    sql = (
+        f'INSERT INTO {qn(table)} ({", ".join(qn(column) for column in columns)}) '
+        f'VALUES ({", ".join(["%s"] * len(columns))})'
+    )
+    inserted = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            inserted += _insert_batch(sql, batch)
+            batch = []
+    if batch:
+        inserted += _insert_batch(sql, batch)
+    return inserted
+
+
+def _insert_batch(sql, batch):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, batch)
+    return len(batch)
+
+
+def generate_games(count, seed=1, batch_size=10000):
+    """Insert count games and return the (first, last) id range they got."""
+    search = is_supported()
+    if search:
+        # one FTS rebuild at the end is far cheaper than the per-row triggers
+        drop_search_triggers()
+    try:
+        # AUTOINCREMENT never reuses ids, so every new row lands above the current maximum,
+        # though not necessarily right after it (deleted rows keep their ids used up)
+        previous_last = Game.objects.aggregate(last=Max('id'))['last'] or 0
+        opts = Game._meta
+        columns = [opts.get_field(name).column for name in ('name', 'year_released', 'genre', 'studio')]
+        insert_rows(opts.db_table, columns, games_for(count, seed), batch_size)
+    finally:
+        if search:
+            # also after a failed or interrupted load, otherwise the FTS table stops following games_game
+            rebuild_search_index()
+    rebuild_facets()
+    bump_catalog_version()
+    inserted = Game.objects.filter(id__gt=previous_last).aggregate(first=Min('id'), last=Max('id'))
+    return inserted['first'], inserted['last']
+
+
+def generate_users(count, batch_size=10000):
+    """Insert count users sharing one password hash and return their ids."""
+    password = make_password(PASSWORD)
+    start = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+    opts = User._meta
+    columns = [opts.get_field(name).column for name in ('username', 'email', 'first_name', 'last_name', 'password', 'is_active')]
+    rows = (
+        (f'{USERNAME_PREFIX}{number}', f'{USERNAME_PREFIX}{number}@example.com', 'catalog', 'user', password, True)
+        for number in range(start, start + count)
+    )
+    insert_rows(opts.db_table, columns, rows, batch_size)
+    return list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('id').values_list('id', flat=True)[start:])
+
+
+def favorites_for(user_ids, game_range, mean, seed, max_per_user=1000):
+    """
+    Yield (user_id, game_id) pairs. Favorites per user follow a Pareto
+    distribution (most users have a handful, a few have hundreds) and popular
+    games, the low ids of the range, are picked far more often.
+    """
+    rng = random.Random(seed)
+    first, last = game_range
+    games = last - first + 1
+    alpha = 1.5
+    scale = mean * (alpha - 1) / alpha
+    for user_id in user_ids:
+        wanted = min(max_per_user, games, int(scale * rng.paretovariate(alpha)))
+        chosen = set()
+        while len(chosen) < wanted:
+            chosen.add(first + int(games * rng.random() ** 3))
+        for game_id in sorted(chosen):
+            yield user_id, game_id
+
+
+def generate_favorites(user_ids, game_range, mean, seed=1, batch_size=10000):
+    opts = Favorites._meta
+    columns = [opts.get_field('user').column, opts.get_field('game').column]
+    return insert_rows(opts.db_table, columns, favorites_for(user_ids, game_range, mean, seed), batch_size)
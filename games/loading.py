@@ -0,0 +1,88 @@
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from .catalog import bump_catalog_version
+from .facets import rebuild_facets
+from .models import Game
+from utils.streaming import ImportReport, chunked
+
+GAME_FIELDS = ('name', 'year_released', 'genre', 'studio')
+GAME_MODEL_LABEL = Game._meta.label_lower
+
+
+def game_from_record(value):
+    """
+    Build a Game from a Django fixture object ({"model", "pk", "fields"}) or a
+    plain row, coercing values the way loaddata would (e.g. "2000" for
+    year_released). Raises ValidationError for anything that does not fit.
+    """
+    if not isinstance(value, dict):
+        raise ValidationError('expected a JSON object')
+    if 'fields' in value:
+        if str(value.get('model', '')).lower() != GAME_MODEL_LABEL:
+            raise ValidationError(f"unsupported model {value.get('model')}")
+        pk, fields = value.get('pk'), value['fields']
+    else:
+        pk, fields = value.get('id'), value
+    if not isinstance(fields, dict):
+        raise ValidationError('expected fields to be a JSON object')
+    errors = {}
+    data = {}
+    for name in GAME_FIELDS:
+        field = Game._meta.get_field(name)
+        try:
+            data[name] = field.clean(fields.get(name), None)
+        except ValidationError as e:
+            errors[name] = e.messages
+    if pk is not None:
+        try:
+            data['id'] = Game._meta.pk.to_python(pk)
+        except ValidationError as e:
+            errors['pk'] = e.messages
+    if errors:
+        raise ValidationError(errors)
+    return Game(**data)
+
+
+def load_games(records, batch_size=5000, max_reported_errors=1000, progress=None):
+    """
+    Insert (row_number, value, error) records with bulk_create, one transaction
+    per batch. Rows whose pk already exists overwrite the stored game, like
+    loaddata. Signals are not sent, so facets are rebuilt and the catalog
+    version bumped once at the end; the search index follows through its
+    triggers. progress, if given, is called with the report after every batch.
+    """
+    report = ImportReport(max_reported_errors, processed=0, loaded=0)
+
+    for batch in chunked(report.guarded(records), batch_size):
+        report['processed'] += len(batch)
+        games = []
+        for row, value, error in batch:
+            if error is not None:
+                report.add_error(row, {'non_field_errors': [error]})
+                continue
+            try:
+                games.append(game_from_record(value))
+            except ValidationError as e:
+                report.add_error(row, e.message_dict if hasattr(e, 'error_dict') else {'non_field_errors': e.messages})
+        if games:
+            with transaction.atomic():
+                Game.objects.bulk_create(
+                    games, batch_size=batch_size, update_conflicts=True,
+                    unique_fields=['id'], update_fields=list(GAME_FIELDS)
+                )
+            report['loaded'] += len(games)
+        if progress is not None:
+            progress(report)
+
+    if report['loaded']:
+        # explicit pks leave sequences behind on backends that have them
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), [Game])
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+        rebuild_facets()
+        bump_catalog_version()
+    return report
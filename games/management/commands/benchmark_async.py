@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+
+from utils.benchmark import summarize, temporary_token
+
+DEFAULT_PATHS = ['/games/', '/games/1/', '/users/favorites/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare requests/second and p50/p99 latency of the sync API views and their '
+        '/async/ variants, driving the ASGI handler in-process with concurrent requests.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='requests per path and variant')
+        parser.add_argument('--concurrency', type=int, default=50, help='requests in flight at once')
+        parser.add_argument('--path', action='append', dest='paths', help=f'path to benchmark, default {DEFAULT_PATHS}')
+        parser.add_argument('--json', action='store_true', help='print the results as JSON')
+
+    def handle(self, *args, **options):
+        results = []
+        # the in-process client always sends Host: testserver
+        with temporary_token() as authorization, override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            headers = {'Authorization': authorization}
+            for path in options['paths'] or DEFAULT_PATHS:
+                for variant, url in (('sync', path), ('async', f'/async{path}')):
+                    result = asyncio.run(self.run(url, headers, options['requests'], options['concurrency']))
+                    results.append({'path': path, 'variant': variant, **result})
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'path':<24}{'variant':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for result in results:
+            self.stdout.write(
+                f"{result['path']:<24}{result['variant']:<8}{result['rps']:>10.1f}"
+                f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}"
+            )
+
+    async def run(self, url, headers, total, concurrency):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        errors = 0
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+        # warm up caches and connections before measuring
+        await client.get(url, headers=headers)
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+        return {'concurrency': concurrency, **summarize(latencies, elapsed), 'errors': errors}
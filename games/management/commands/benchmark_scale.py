@@ -0,0 +1,156 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from games.catalog import bump_catalog_version
+from games.generation import generate_favorites, generate_games, generate_users
+from users.models import AuthToken, Favorites
+from utils.authentication import token_cache
+from utils.benchmark import QueryCounter, summarize
+
+DEFAULT_SIZES = [10000, 1000000, 10000000]
+
+ENDPOINTS = [
+    ('games first page', '/games/'),
+    ('games middle page', '/games/?page={middle_page}'),
+    ('games cursor', '/games/?pagination=cursor'),
+    ('games genre', '/games/?genre=RPG'),
+    ('games year', '/games/?year_released=2020'),
+    ('game', '/games/{game_id}/'),
+    ('facets', '/games/facets/'),
+    ('facets top 20', '/games/facets/?limit=20'),
+    ('search', '/games/search/?q=Dark%20Storm'),
+    ('favorites typical user', '/users/favorites/', 'typical'),
+    ('favorites heaviest user', '/users/favorites/', 'heaviest'),
+]
+
+
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate catalogs of increasing size (generate_catalog data) in throwaway file databases '
+        'and measure latency percentiles, queries/request and Python memory per request of the '
+        'games and favorites endpoints at each size. Response caches are bypassed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='catalog sizes in games')
+        parser.add_argument('--users', type=int, default=1000, help='users per catalog')
+        parser.add_argument('--favorites', type=float, default=20, help='mean favorites per user')
+        parser.add_argument('--requests', type=int, default=50, help='timed requests per endpoint')
+        parser.add_argument('--memory-requests', type=int, default=3, help='requests per endpoint traced for memory')
+        parser.add_argument('--seed', type=int, default=1, help='random seed for the generated catalog')
+        parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        report = {'config': {key: options[key] for key in ('sizes', 'users', 'favorites', 'requests', 'seed')}, 'sizes': []}
+        old_name = connection.settings_dict['NAME']
+        old_test_name = connection.settings_dict['TEST'].get('NAME')
+        with tempfile.TemporaryDirectory() as directory:
+            for size in options['sizes']:
+                path = os.path.join(directory, f'scale_{size}.sqlite3')
+                connection.settings_dict['TEST']['NAME'] = path
+                connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                try:
+                    with override_settings(DEBUG=False, PERFORMANCE_LOG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                        report['sizes'].append(self.measure_size(size, path, options))
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+                    connection.settings_dict['TEST']['NAME'] = old_test_name
+                self.stderr.write(f'{size:,} games done')
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def measure_size(self, size, path, options):
+        started = time.perf_counter()
+        game_range = generate_games(size, options['seed'])
+        user_ids = generate_users(options['users'])
+        favorites = generate_favorites(user_ids, game_range, options['favorites'], options['seed'])
+        generate_seconds = time.perf_counter() - started
+
+        by_count = list(
+            Favorites.objects.values('user_id').annotate(total=Count('id')).order_by('-total').values_list('user_id', flat=True)
+        )
+        expires = timezone.now() + timedelta(days=1)
+        tokens = {}
+        for role, user_id in (('heaviest', by_count[0]), ('typical', by_count[len(by_count) // 2])) if by_count else ():
+            tokens[role] = AuthToken.objects.create(user_id=user_id, expires=expires).key
+        tokens.setdefault('default', AuthToken.objects.create(user_id=user_ids[0], expires=expires).key)
+        values = {'middle_page': max(1, size // 10 // 2), 'game_id': (game_range[0] + game_range[1]) // 2}
+
+        client = Client()
+        endpoints = {}
+        for name, template, *role in ENDPOINTS:
+            token = tokens.get(role[0] if role else 'default', tokens['default'])
+            headers = {'Authorization': f'Token {token}'}
+            endpoints[name] = self.measure_endpoint(client, template.format(**values), headers, options)
+
+        token_cache.clear()
+        database_bytes = sum(os.path.getsize(f'{path}{suffix}') for suffix in ('', '-wal') if os.path.exists(f'{path}{suffix}'))
+        return {
+            'games': size,
+            'users': len(user_ids),
+            'favorites': favorites,
+            'generate_seconds': generate_seconds,
+            'database_bytes': database_bytes,
+            'rss_bytes': rss_bytes(),
+            'endpoints': endpoints,
+        }
+
+    def measure_endpoint(self, client, path, headers, options):
+        # warm-up fills the token cache and SQLite's page cache
+        client.get(path, headers=headers)
+        latencies = []
+        statuses = set()
+        with QueryCounter() as counter:
+            for _ in range(options['requests']):
+                # a new catalog version makes the response cache and the ETag miss
+                bump_catalog_version()
+                request_started = time.perf_counter()
+                response = client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - request_started)
+                statuses.add(response.status_code)
+            queries = counter.count
+
+        peak = 0
+        tracemalloc.start()
+        try:
+            for _ in range(options['memory_requests']):
+                bump_catalog_version()
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                response = client.get(path, headers=headers)
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'path': path,
+            **summarize(latencies),
+            'queries_per_request': queries / len(latencies) if latencies else 0.0,
+            'peak_python_bytes': peak,
+            'response_bytes': len(response.content),
+            'statuses': sorted(statuses),
+        }
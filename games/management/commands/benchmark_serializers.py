@@ -0,0 +1,64 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from games.models import Game
+from games.serializers import GetGameSerializer, GameValuesSerializer
+
+DEFAULT_SIZES = [25, 1000, 100000]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure rows/second of GetGameSerializer against the GameValuesSerializer fast path, '
+        'ORM fetch included. Benchmark rows are inserted in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='rows per serialization')
+        parser.add_argument('--min-time', type=float, default=0.5, help='seconds to repeat each measurement for')
+        parser.add_argument('--json', action='store_true', help='print the results as JSON')
+
+    def handle(self, *args, **options):
+        sizes = options['sizes']
+        results = []
+        with transaction.atomic():
+            Game.objects.bulk_create(
+                (Game(name=f'Benchmark game {i}', year_released=1980 + i % 45, genre=f'genre {i % 20}', studio=f'studio {i % 500}')
+                 for i in range(max(sizes))),
+                batch_size=1000
+            )
+            games = Game.objects.order_by('id')
+            for size in sizes:
+                model_path = self.measure(lambda: GetGameSerializer(games[:size], many=True).data, size, options['min_time'])
+                fast_path = self.measure(lambda: list(GameValuesSerializer.values(games[:size])), size, options['min_time'])
+                results.append({
+                    'rows': size,
+                    'model_serializer_rows_per_s': model_path,
+                    'values_serializer_rows_per_s': fast_path,
+                    'speedup': fast_path / model_path if model_path else 0.0,
+                })
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'rows':>8}{'ModelSerializer rows/s':>26}{'values() rows/s':>20}{'speedup':>10}")
+        for result in results:
+            self.stdout.write(
+                f"{result['rows']:>8}{result['model_serializer_rows_per_s']:>26,.0f}"
+                f"{result['values_serializer_rows_per_s']:>20,.0f}{result['speedup']:>9.1f}x"
+            )
+
+    @staticmethod
+    def measure(serialize, size, min_time):
+        runs = 0
+        started = time.perf_counter()
+        while True:
+            serialize()
+            runs += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                return runs * size / elapsed
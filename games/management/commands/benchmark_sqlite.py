@@ -0,0 +1,135 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from copy import deepcopy
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from games.models import Game
+from utils.benchmark import summarize
+
+GENRES = ['RPG', 'action RPG', 'strategia', 'przygodowe', 'platformowa', 'sportowa', 'logiczna', 'FPS']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrent read/write throughput of the stock SQLite settings and the production '
+        'profile (WAL, tuned pragmas, IMMEDIATE transactions, persistent connections) on two '
+        'throwaway database files. Every operation ends like a request does, by closing '
+        'connections that are past CONN_MAX_AGE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, default=20000, help='games seeded into each database')
+        parser.add_argument('--readers', type=int, default=8, help='reader threads')
+        parser.add_argument('--writers', type=int, default=2, help='writer threads')
+        parser.add_argument('--duration', type=float, default=10.0, help='seconds to run each profile for')
+        parser.add_argument('--profiles', nargs='+', choices=['default', 'production'], default=['default', 'production'])
+        parser.add_argument('--json', action='store_true', help='print the results as JSON')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('benchmark_sqlite needs the default database to be SQLite')
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in options['profiles']:
+                alias = self.add_database(profile, os.path.join(directory, f'{profile}.sqlite3'))
+                try:
+                    call_command('migrate', database=alias, verbosity=0)
+                    self.seed(alias, options['games'])
+                    results.append({'profile': profile, **self.run(alias, options)})
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'profile':<12}{'reads/s':>10}{'read p99 ms':>13}{'writes/s':>10}{'write p99 ms':>14}{'locked':>8}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['profile']:<12}{result['reads']['rps']:>10.0f}{result['reads']['p99_ms']:>13.2f}"
+                f"{result['writes']['rps']:>10.0f}{result['writes']['p99_ms']:>14.2f}{result['locked_errors']:>8}"
+            )
+
+    @staticmethod
+    def add_database(profile, name):
+        alias = f'benchmark_{profile}'
+        database = deepcopy(connections.settings['default'])
+        database.update({'NAME': name, 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'OPTIONS': {}})
+        if profile == 'production':
+            database.update({
+                'CONN_MAX_AGE': settings.SQLITE_PRODUCTION_CONN_MAX_AGE,
+                'CONN_HEALTH_CHECKS': True,
+                'OPTIONS': deepcopy(settings.SQLITE_PRODUCTION_OPTIONS),
+            })
+        connections.settings[alias] = database
+        return alias
+
+    @staticmethod
+    def seed(alias, count):
+        rng = random.Random(1)
+        Game.objects.using(alias).bulk_create(
+            (Game(name=f'Game {i}', year_released=rng.randint(1980, 2025), genre=rng.choice(GENRES), studio=f'Studio {rng.randrange(500)}')
+             for i in range(count)),
+            batch_size=1000
+        )
+
+    def run(self, alias, options):
+        deadline = time.perf_counter() + options['duration']
+        latencies = {'reads': [], 'writes': []}
+        locked = 0
+        lock = threading.Lock()
+
+        def worker(kind, seed):
+            nonlocal locked
+            rng = random.Random(seed)
+            samples = []
+            errors = 0
+            connection = connections[alias]
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        if kind == 'reads':
+                            # the GamesApi list query for one genre page
+                            list(Game.objects.using(alias).filter(genre=rng.choice(GENRES)).values()[:25])
+                        else:
+                            # GamesApi.post style write; bulk_create skips the signals so only the database is measured
+                            with transaction.atomic(using=alias):
+                                Game.objects.using(alias).bulk_create([
+                                    Game(name='benchmark write', year_released=2000, genre=rng.choice(GENRES), studio='benchmark')
+                                ])
+                        samples.append(time.perf_counter() - started)
+                    except OperationalError:
+                        errors += 1
+                    # what request_finished does at the end of every request
+                    connection.close_if_unusable_or_obsolete()
+            finally:
+                connection.close()
+                with lock:
+                    latencies[kind].extend(samples)
+                    locked += errors
+
+        threads = [threading.Thread(target=worker, args=('reads', i)) for i in range(options['readers'])]
+        threads += [threading.Thread(target=worker, args=('writes', 1000 + i)) for i in range(options['writers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'reads': summarize(latencies['reads'], elapsed),
+            'writes': summarize(latencies['writes'], elapsed),
+            'locked_errors': locked,
+        }
@@ -0,0 +1,66 @@
+import json
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.benchmark import temporary_token
+from utils.startup import run_boot
+
+# environment of the booted workers per mode
+MODES = {
+    'eager': {'API_DOCS': '1', 'SCHEMA_LAZY': '0'},
+    'lazy': {'API_DOCS': '1', 'SCHEMA_LAZY': '1'},
+    'api-only': {'API_DOCS': '0', 'SCHEMA_LAZY': '1'},
+}
+PHASES = ['interpreter_ms', 'setup_ms', 'application_ms', 'first_request_ms', 'time_to_first_request_ms']
+
+
+class Command(BaseCommand):
+    help = (
+        'Time-to-first-request of a freshly started worker: spawn new interpreters that boot the '
+        'WSGI application and serve one authenticated request, for eager schema decorations, lazy '
+        'ones and API-only workers without the docs apps, and report the median of each phase.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='worker starts per mode')
+        parser.add_argument('--path', default='/games/1/', help='path of the first request')
+        parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+        parser.add_argument('--json', action='store_true', help='print the results as JSON')
+
+    def handle(self, *args, **options):
+        with temporary_token() as authorization:
+            results = [self.run_mode(mode, options, authorization) for mode in options['modes']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'mode':<10}{'python ms':>11}{'setup ms':>10}{'app ms':>9}{'request ms':>12}{'total ms':>10}{'modules':>9}{'status':>8}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<10}{result['interpreter_ms']:>11.1f}{result['setup_ms']:>10.1f}"
+                f"{result['application_ms']:>9.1f}{result['first_request_ms']:>12.1f}"
+                f"{result['time_to_first_request_ms']:>10.1f}{result['modules']:>9}{result['status']:>8}"
+            )
+
+    def run_mode(self, mode, options, authorization):
+        runs = []
+        # one unmeasured start warms the OS page cache and the bytecode cache
+        for run in range(options['runs'] + 1):
+            try:
+                result, _ = run_boot(settings.BASE_DIR, env=MODES[mode], path=options['path'], authorization=authorization)
+            except RuntimeError as e:
+                raise CommandError(f'{mode} worker failed to boot: {e}')
+            if run:
+                runs.append(result)
+        return {
+            'mode': mode,
+            'runs': len(runs),
+            **{phase: statistics.median(run[phase] for run in runs) for phase in PHASES},
+            'status': runs[-1]['status'],
+            'modules': runs[-1]['modules'],
+            'drf_spectacular_loaded': runs[-1]['drf_spectacular_loaded'],
+        }
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from utils.schema import schema_artifact
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the OpenAPI schema once and write it as versioned JSON and YAML artifacts '
+        '(SCHEMA_ARTIFACT_DIR/openapi-<VERSION>.<format>) served by /schema/. Run it on every deploy.'
+    )
+
+    def handle(self, *args, **options):
+        for path in schema_artifact.write():
+            self.stdout.write(self.style.SUCCESS(f'wrote {path}'))
@@ -0,0 +1,68 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from games.loading import load_games
+from utils.streaming import iter_json_records, iter_ndjson
+
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream a games fixture (a loaddata JSON array or NDJSON, with fixture objects or plain '
+        'game rows) into the catalog with bulk_create in batches, printing progress and rows/second. '
+        'Rows with an existing pk overwrite the stored game.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="fixture file, '-' reads standard input")
+        parser.add_argument('--format', choices=['json', 'ndjson'], help='input format, defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=5000, help='rows inserted per transaction')
+        parser.add_argument('--max-errors', type=int, default=1000, help='rejected rows listed in the report')
+        parser.add_argument('--json', action='store_true', help='print the final report as JSON')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('ndjson' if path.lower().endswith(NDJSON_EXTENSIONS) else 'json')
+        try:
+            stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        except OSError as e:
+            raise CommandError(f'cannot read {path}: {e}')
+        records = iter_ndjson(stream) if file_format == 'ndjson' else iter_json_records(stream)
+
+        started = time.perf_counter()
+        last_report = started
+
+        def progress(report):
+            nonlocal last_report
+            now = time.perf_counter()
+            if now - last_report >= 1:
+                last_report = now
+                self.stderr.write(
+                    f"{report['processed']:,} rows, {report['loaded']:,} loaded, {report['failed']:,} rejected, "
+                    f"{report['processed'] / (now - started):,.0f} rows/s"
+                )
+
+        try:
+            report = load_games(records, options['batch_size'], options['max_errors'], progress)
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+        report['seconds'] = time.perf_counter() - started
+        report['rows_per_second'] = report['processed'] / report['seconds'] if report['seconds'] else 0.0
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for error in report['errors']:
+            details = '; '.join(f'{field}: {" ".join(map(str, messages))}' for field, messages in error['errors'].items())
+            self.stdout.write(f"row {error['row']}: {details}")
+        if 'message' in report:
+            self.stdout.write(self.style.ERROR(f"stopped early: {report['message']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"loaded {report['loaded']:,} of {report['processed']:,} games in {report['seconds']:.1f}s "
+            f"({report['rows_per_second']:,.0f} rows/s), {report['failed']:,} rejected"
+        ))
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.utils import timezone
+
+from games.models import Game
+from games.pagination import GamePagination
+from users.models import AuthToken, Favorites, User
+from utils.authentication import token_cache
+from utils.benchmark import QueryCounter, summarize
+
+PASSWORD = 'loadtest-password'
+GENRES = ['RPG', 'action RPG', 'strategia', 'przygodowe', 'platformowa', 'sportowa', 'logiczna', 'FPS']
+# {page} is drawn from the first MAX_PAGES pages of the list the request actually filters
+MAX_PAGES = 50
+# template placeholders that filter the games list, with the Game field they filter on
+PAGE_FILTERS = (('genre', 'genre'), ('year', 'year_released'))
+
+# default request mix; a --mix file holds the same objects one per line (JSONL)
+DEFAULT_MIX = [
+    {'name': 'auth', 'method': 'POST', 'path': '/users/auth/', 'auth': False,
+     'body': {'username': '{login_username}', 'password': '{password}'}, 'weight': 1},
+    {'name': 'games', 'method': 'GET', 'path': '/games/?page={page}', 'weight': 10},
+    {'name': 'games genre', 'method': 'GET', 'path': '/games/?genre={genre}&page={page}', 'weight': 10},
+    {'name': 'games year', 'method': 'GET', 'path': '/games/?year_released={year}', 'weight': 5},
+    {'name': 'games genre year', 'method': 'GET', 'path': '/games/?genre={genre}&year_released={year}', 'weight': 5},
+    {'name': 'game', 'method': 'GET', 'path': '/games/{game_id}/', 'weight': 20},
+    {'name': 'favorites', 'method': 'GET', 'path': '/users/favorites/', 'weight': 10},
+    {'name': 'favorite', 'method': 'GET', 'path': '/users/favorites/{favorite_id}/', 'weight': 5},
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database with a catalog, users and favorites, replay a JSONL '
+        'request mix against the WSGI and ASGI handlers in-process and report latency '
+        'percentiles, requests/second and queries/request as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, default=10000, help='games to seed')
+        parser.add_argument('--users', type=int, default=100, help='users holding tokens and favorites')
+        parser.add_argument('--favorites', type=int, default=20, help='favorites per user')
+        parser.add_argument('--requests', type=int, default=2000, help='requests replayed per handler')
+        parser.add_argument('--concurrency', type=int, default=1, help='requests in flight for the ASGI handler')
+        parser.add_argument('--mix', help='JSONL file with one request template per line, defaults to a built-in mix')
+        parser.add_argument('--in-order', action='store_true', help='replay the mix lines in order instead of by weight')
+        parser.add_argument('--handlers', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+        parser.add_argument('--seed', type=int, default=1, help='random seed for data and request sampling')
+        parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        mix = self.load_mix(options['mix'])
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(DEBUG=False, PERFORMANCE_LOG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                started = time.perf_counter()
+                data = self.seed(options)
+                seed_seconds = time.perf_counter() - started
+                requests = self.build_requests(mix, data, options)
+                report = {
+                    'config': {
+                        key: options[key]
+                        for key in ('games', 'users', 'favorites', 'requests', 'concurrency', 'seed', 'mix', 'in_order')
+                    },
+                    'seed_seconds': seed_seconds,
+                    'handlers': {},
+                }
+                for handler in options['handlers']:
+                    self.reset_caches()
+                    if handler == 'wsgi':
+                        results = self.run_wsgi(requests)
+                    else:
+                        results = asyncio.run(self.run_asgi(requests, options['concurrency']))
+                    report['handlers'][handler] = results
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def load_mix(self, path):
+        if not path:
+            return DEFAULT_MIX
+        try:
+            with open(path) as f:
+                mix = [json.loads(line) for line in f if line.strip()]
+        except (OSError, json.JSONDecodeError) as e:
+            raise CommandError(f'cannot read request mix {path}: {e}')
+        if not mix:
+            raise CommandError(f'request mix {path} is empty')
+        return mix
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+        Game.objects.bulk_create(
+            (Game(name=f'Game {i}', year_released=rng.randint(1980, 2025), genre=rng.choice(GENRES), studio=f'Studio {rng.randrange(500)}')
+             for i in range(options['games'])),
+            batch_size=1000
+        )
+        game_ids = list(Game.objects.values_list('id', flat=True))
+        # one PBKDF2 hash shared by every seeded user keeps seeding fast
+        password = make_password(PASSWORD)
+        login_count = max(1, options['users'] // 10)
+        User.objects.bulk_create(
+            User(username=f'loadtest{i}', email=f'loadtest{i}@example.com', first_name='load', last_name='test', password=password)
+            for i in range(options['users'] + login_count)
+        )
+        users = list(User.objects.order_by('id'))
+        readers, logins = users[:options['users']], users[options['users']:]
+        expires = timezone.now() + timedelta(days=1)
+        tokens = [AuthToken(key=AuthToken.generate_key(), user=user, expires=expires) for user in readers]
+        AuthToken.objects.bulk_create(tokens)
+        Favorites.objects.bulk_create(
+            Favorites(user=user, game_id=game_id)
+            for user in readers
+            for game_id in rng.sample(game_ids, min(options['favorites'], len(game_ids)))
+        )
+        favorites = defaultdict(list)
+        for favorite_id, user_id in Favorites.objects.values_list('id', 'user_id'):
+            favorites[user_id].append(favorite_id)
+        years = list(Game.objects.values_list('year_released', flat=True).distinct())
+        # games per combination of filter values, keyed like the filters picked in build_requests()
+        totals = Counter()
+        for row in Game.objects.values(*(field for _, field in PAGE_FILTERS)).iterator():
+            values = [(name, row[field]) for name, field in PAGE_FILTERS]
+            totals.update([(), *((value,) for value in values), tuple(values)])
+        return {
+            'readers': [(user.id, token.key) for user, token in zip(readers, tokens)],
+            'logins': [user.username for user in logins],
+            'game_ids': game_ids,
+            'favorites': favorites,
+            'years': years,
+            'pages': {key: min(-(-total // GamePagination.page_size), MAX_PAGES) for key, total in totals.items()},
+        }
+
+    def build_requests(self, mix, data, options):
+        rng = random.Random(options['seed'])
+        if options['in_order']:
+            templates = [mix[i % len(mix)] for i in range(options['requests'])]
+        else:
+            templates = rng.choices(mix, weights=[entry.get('weight', 1) for entry in mix], k=options['requests'])
+        requests = []
+        for template in templates:
+            user_id, token = rng.choice(data['readers'])
+            values = {
+                'game_id': rng.choice(data['game_ids']),
+                'favorite_id': rng.choice(data['favorites'][user_id] or [0]),
+                'genre': rng.choice(GENRES),
+                'year': rng.choice(data['years']),
+                'login_username': rng.choice(data['logins']),
+                'password': PASSWORD,
+            }
+            # a page past the end of the filtered list would be a 404, not a page read
+            filters = tuple((name, values[name]) for name, _ in PAGE_FILTERS if f'{{{name}}}' in template['path'])
+            values['page'] = rng.randint(1, data['pages'].get(filters, 1))
+            body = template.get('body')
+            if body is not None:
+                body = {key: str(value).format(**values) for key, value in body.items()}
+            headers = {'Authorization': f'Token {token}'} if template.get('auth', True) else {}
+            requests.append({
+                'name': template.get('name') or f"{template.get('method', 'GET')} {template['path']}",
+                'method': template.get('method', 'GET').upper(),
+                'path': template['path'].format(**values),
+                'body': body,
+                'headers': headers,
+            })
+        return requests
+
+    def reset_caches(self):
+        token_cache.clear()
+        for cache in caches.all(initialized_only=True):
+            cache.clear()
+
+    def run_wsgi(self, requests):
+        client = Client()
+        samples = []
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            for request in requests:
+                queries = counter.count
+                request_started = time.perf_counter()
+                response = client.generic(
+                    request['method'], request['path'],
+                    json.dumps(request['body']) if request['body'] is not None else '',
+                    content_type='application/json', headers=request['headers']
+                )
+                samples.append((request['name'], time.perf_counter() - request_started, counter.count - queries, response.status_code))
+            elapsed = time.perf_counter() - started
+        return self.report(samples, elapsed)
+
+    async def run_asgi(self, requests, concurrency):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+        samples = []
+
+        async def one(request):
+            async with semaphore:
+                queries = counter.count
+                request_started = time.perf_counter()
+                response = await client.generic(
+                    request['method'], request['path'],
+                    json.dumps(request['body']) if request['body'] is not None else '',
+                    content_type='application/json', headers=request['headers']
+                )
+                # with concurrency > 1 the query delta also includes overlapping requests
+                samples.append((request['name'], time.perf_counter() - request_started, counter.count - queries, response.status_code))
+
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            await asyncio.gather(*(one(request) for request in requests))
+            elapsed = time.perf_counter() - started
+        return self.report(samples, elapsed)
+
+    def report(self, samples, elapsed):
+        by_name = defaultdict(list)
+        for sample in samples:
+            by_name[sample[0]].append(sample)
+
+        def describe(group, group_elapsed=None):
+            return {
+                **summarize([duration for _, duration, _, _ in group], group_elapsed),
+                'queries_per_request': sum(queries for _, _, queries, _ in group) / len(group),
+                'errors': sum(1 for _, _, _, code in group if code >= 400),
+            }
+
+        return {
+            'overall': describe(samples, elapsed),
+            'endpoints': {name: describe(group) for name, group in sorted(by_name.items())},
+        }
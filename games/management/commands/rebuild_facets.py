@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from games.facets import rebuild_facets
+from games.models import GameFacet
+
+
+class Command(BaseCommand):
+    help = 'Recompute the games facet counts (genre, year_released, studio) from the whole catalog.'
+
+    def handle(self, *args, **options):
+        rebuild_facets()
+        self.stdout.write(self.style.SUCCESS(f'games facets rebuilt, {GameFacet.objects.count()} values'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games.search import is_supported, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Recreate the games full-text search table and triggers and reindex every game.'
+
+    def handle(self, *args, **options):
+        if not is_supported():
+            raise CommandError('full-text search index is only available on SQLite')
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS('games search index rebuilt'))
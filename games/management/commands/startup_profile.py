@@ -0,0 +1,60 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.startup import by_package, parse_importtime, run_boot
+
+
+class Command(BaseCommand):
+    help = (
+        'Boot the application in a fresh interpreter under `python -X importtime` and report '
+        'where worker start-up time goes: phases, slowest modules and time per top-level package.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25, help='modules and packages listed')
+        parser.add_argument('--sort', choices=['self', 'cumulative'], default='self', help='order of the module list')
+        parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                            help='environment override for the booted process, e.g. API_DOCS=0')
+        parser.add_argument('--json', action='store_true', help='print the report as JSON')
+
+    def handle(self, *args, **options):
+        env = {}
+        for override in options['env']:
+            name, separator, value = override.partition('=')
+            if not separator:
+                raise CommandError(f'--env expects NAME=VALUE, got {override!r}')
+            env[name] = value
+        try:
+            phases, stderr = run_boot(settings.BASE_DIR, env=env, importtime=True)
+        except RuntimeError as e:
+            raise CommandError(f'application failed to boot: {e}')
+
+        modules = parse_importtime(stderr)
+        column = 1 if options['sort'] == 'self' else 2
+        slowest = sorted(modules, key=lambda module: -module[column])[:options['top']]
+        packages = by_package(modules)[:options['top']]
+        report = {
+            'env': env,
+            'phases': phases,
+            'import_ms': sum(self_us for _, self_us, _ in modules) / 1000,
+            'modules': [{'module': name, 'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000}
+                        for name, self_us, cumulative_us in slowest],
+            'packages': [{'package': name, 'self_ms': self_us / 1000, 'modules': count}
+                         for name, self_us, count in packages],
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self.stdout.write(', '.join(f'{name} {value:.1f}' for name, value in phases.items() if name.endswith('_ms')))
+        self.stdout.write(f"imports {report['import_ms']:.1f} ms in {len(modules)} modules, drf_spectacular loaded: {phases['drf_spectacular_loaded']}")
+        self.stdout.write('')
+        self.stdout.write(f"{'module':<56}{'self ms':>10}{'cumul. ms':>11}")
+        for module in report['modules']:
+            self.stdout.write(f"{module['module']:<56}{module['self_ms']:>10.1f}{module['cumulative_ms']:>11.1f}")
+        self.stdout.write('')
+        self.stdout.write(f"{'package':<56}{'self ms':>10}{'modules':>11}")
+        for package in report['packages']:
+            self.stdout.write(f"{package['package']:<56}{package['self_ms']:>10.1f}{package['modules']:>11}")
@@ -0,0 +1,42 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database into every DATABASE_READ_REPLICAS file with the '
+        'SQLite online backup API. Run it once, or with --interval to emulate replication lag.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='keep running and copy every INTERVAL seconds')
+        parser.add_argument('--pages', type=int, default=-1, help='pages copied per backup step, -1 copies all at once')
+
+    def handle(self, *args, **options):
+        replicas = getattr(settings, 'DATABASE_READ_REPLICAS', [])
+        if not replicas:
+            raise CommandError('no replicas configured, set DATABASE_REPLICAS')
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('sync_replicas copies SQLite databases only')
+
+        while True:
+            primary.ensure_connection()
+            for alias in replicas:
+                started = time.perf_counter()
+                connections[alias].close()
+                target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+                try:
+                    # the backup API copies a consistent snapshot while the primary keeps serving writes
+                    primary.connection.backup(target, pages=options['pages'])
+                finally:
+                    target.close()
+                self.stdout.write(f'{alias} synced in {time.perf_counter() - started:.2f}s')
+            if not options['interval']:
+                return
+            primary.close()
+            time.sleep(options['interval'])
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+FTS_TABLE = 'games_game_fts'
+
+CREATE_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, studio, genre,
+        content='games_game', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON games_game BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, studio, genre) VALUES (new.id, new.name, new.studio, new.genre);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON games_game BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, studio, genre) VALUES ('delete', old.id, old.name, old.studio, old.genre);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON games_game BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, studio, genre) VALUES ('delete', old.id, old.name, old.studio, old.genre);
+        INSERT INTO {FTS_TABLE}(rowid, name, studio, genre) VALUES (new.id, new.name, new.studio, new.genre);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0002_game_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:46
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_facets(apps, schema_editor):
+    Game = apps.get_model('games', 'Game')
+    GameFacet = apps.get_model('games', 'GameFacet')
+    db_alias = schema_editor.connection.alias
+    for field in ('genre', 'year_released', 'studio'):
+        rows = Game.objects.using(db_alias).order_by().values(field).annotate(total=Count('id'))
+        GameFacet.objects.using(db_alias).bulk_create(GameFacet(dimension=field, value=str(row[field]), count=row['total']) for row in rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_game_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=16, verbose_name='dimension')),
+                ('value', models.CharField(max_length=64, verbose_name='value')),
+                ('count', models.IntegerField(default=0, verbose_name='count')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'value'), name='games_facet_dimension_value_uniq')],
+            },
+        ),
+        migrations.RunPython(count_facets, migrations.RunPython.noop),
+    ]
@@ -5,3 +5,27 @@ class Game(models.Model):
     year_released = models.IntegerField("year_released")
     genre = models.CharField("genre", max_length=64)
     studio = models.CharField("studio", max_length=64)
+
+    class Meta:
+        indexes = [
+            # genre and genre + year_released filters in GamesApi.get
+            models.Index(fields=['genre', 'year_released'], name='games_genre_year_idx'),
+            # genre filter with the default id cursor ordering: seeks genre=? AND id>? without a sort
+            models.Index(fields=['genre', 'id'], name='games_genre_id_idx'),
+            # year_released filter and the year_released cursor ordering
+            models.Index(fields=['year_released'], name='games_year_idx'),
+        ]
+
+class GameFacet(models.Model):
+    """
+    Number of games per distinct genre, year_released and studio value, kept
+    up to date incrementally by games.facets so facet reads never scan Game.
+    """
+    dimension = models.CharField('dimension', max_length=16)
+    value = models.CharField('value', max_length=64)
+    count = models.IntegerField('count', default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'value'], name='games_facet_dimension_value_uniq'),
+        ]
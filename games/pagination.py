@@ -0,0 +1,49 @@
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+
+from utils.pagination import KeysetPagination
+
+
+class GamePagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 25
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # same steps as paginate_queryset, with the COUNT and the page fetched through the async ORM
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        bottom = (number - 1) * page_size
+        top = bottom + page_size
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        rows = [obj async for obj in queryset[bottom:top]]
+        self.page = paginator._get_page(rows, number, paginator)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return rows
+
+
+class GameCursorPagination(KeysetPagination):
+    page_size = GamePagination.page_size
+    page_size_query_param = GamePagination.page_size_query_param
+    max_page_size = GamePagination.max_page_size
+    orderings = {
+        'id': ('id',),
+        'year_released': ('year_released', 'id'),
+    }
+    equality_filters = ('genre', 'year_released')
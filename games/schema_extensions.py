@@ -1,6 +1,17 @@
-from drf_spectacular.utils import OpenApiExample, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse
 
-from games.serializers import GetGameSerializer, DummyResponseSerializer, CreateGameSerializer
+from games.serializers import GetGameSerializer, DummyResponseSerializer, CreateGameSerializer, \
+    DummyBulkResponseSerializer, DummyFacetsResponseSerializer, GameBatchSerializer, DummyGamesBatchResponseSerializer
+
+fields_parameter = OpenApiParameter(
+    name='fields',
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description='Pola gry oddzielone przecinkami: id, name, year_released, genre, studio (domyślnie wszystkie); '
+                'nieznane pole zwraca błąd 400',
+    required=False
+)
 
 get_games_api_schema = {
     "parameters": [
@@ -19,7 +30,31 @@ get_games_api_schema = {
             description='Rok wydania gry',
             required=False,
             default=1999
-        )
+        ),
+        OpenApiParameter(
+            name='pagination',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Tryb paginacji: page (domyślnie) lub cursor (bez COUNT i OFFSET, count ma wartość null)',
+            required=False,
+            enum=['page', 'cursor']
+        ),
+        OpenApiParameter(
+            name='ordering',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Sortowanie w trybie cursor: id (domyślnie) lub year_released',
+            required=False,
+            enum=['id', 'year_released']
+        ),
+        OpenApiParameter(
+            name='cursor',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Kursor zwrócony w polach next/previous w trybie cursor',
+            required=False
+        ),
+        fields_parameter
     ],
     "responses": {
         200: GetGameSerializer,
@@ -121,8 +156,10 @@ post_games_api_schema = {
 }
 
 get_game_api_schema = {
+    "parameters": [fields_parameter],
     "responses": {
                 200: GetGameSerializer,
+                400: DummyResponseSerializer,
                 401: DummyResponseSerializer,
                 404: DummyResponseSerializer,
             },
@@ -156,4 +193,288 @@ get_game_api_schema = {
         )
     ],
     "summary": "Get games by id"
+}
+
+games_batch_examples = [
+    OpenApiExample(
+        name='Games in the requested order',
+        value={
+            "games": [
+                {"id": 3, "name": "Game", "year_released": 2000, "genre": "cRPG", "studio": "Somestudio"},
+                {"id": 1, "name": "Other game", "year_released": 1998, "genre": "RPG", "studio": "Otherstudio"}
+            ],
+            "not_found": [999]
+        },
+        response_only=True,
+        media_type='application/json',
+        status_codes=['200']
+    ),
+    OpenApiExample(
+        name='Login failed, credentials not valid',
+        value={'message': 'unauthorized'},
+        response_only=True,
+        media_type='application/json',
+        status_codes=['401']
+    ),
+    OpenApiExample(
+        name='Bad request',
+        value={'message': 'wrong input data', 'errors': {'ids': ['Ensure this field has no more than 1000 elements.']}},
+        response_only=True,
+        media_type='application/json',
+        status_codes=['400']
+    )
+]
+
+get_games_batch_api_schema = {
+    "parameters": [
+        OpenApiParameter(
+            name='ids',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Identyfikatory gier oddzielone przecinkami, np. 3,1,999 (maksymalnie GAMES_BATCH_MAX_SIZE)',
+            required=True
+        ),
+        fields_parameter
+    ],
+    "responses": {
+        200: DummyGamesBatchResponseSerializer,
+        400: DummyResponseSerializer,
+        401: DummyResponseSerializer,
+    },
+    "examples": games_batch_examples,
+    "summary": "Get many games by id"
+}
+
+post_games_batch_api_schema = {
+    "request": GameBatchSerializer,
+    "parameters": [fields_parameter],
+    "responses": {
+        200: DummyGamesBatchResponseSerializer,
+        400: DummyResponseSerializer,
+        401: DummyResponseSerializer,
+    },
+    "examples": [
+        OpenApiExample(
+            name='Game ids',
+            value={'ids': [3, 1, 999]},
+            request_only=True,
+            media_type='application/json'
+        ),
+        *games_batch_examples
+    ],
+    "summary": "Get many games by id, ids in the request body"
+}
+
+get_game_search_api_schema = {
+    "parameters": [
+        OpenApiParameter(
+            name='q',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Szukana fraza (nazwa gry, studio lub gatunek), dopasowanie po prefiksach słów',
+            required=True
+        ),
+        OpenApiParameter(
+            name='page',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Numer strony',
+            required=False
+        ),
+        OpenApiParameter(
+            name='page_size',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Liczba wyników na stronie (maksymalnie 25)',
+            required=False
+        )
+    ],
+    "responses": {
+        200: GetGameSerializer,
+        400: DummyResponseSerializer,
+        401: DummyResponseSerializer,
+        404: DummyResponseSerializer,
+    },
+    "examples": [
+        OpenApiExample(
+            name='Search games ranked by relevance',
+            value={
+                "count": 2,
+                "next": None,
+                "previous": None,
+                "results": [
+                    {
+                        "id": 1,
+                        "name": "Baldur's Gate II",
+                        "year_released": 2000,
+                        "genre": "RPG",
+                        "studio": "BioWare"
+                    },
+                    {
+                        "id": 5,
+                        "name": "Baldur's Gate",
+                        "year_released": 1998,
+                        "genre": "RPG",
+                        "studio": "BioWare"
+                    }
+                ]
+            },
+            response_only=True,
+            media_type='application/json',
+            status_codes=['200']
+        ),
+        OpenApiExample(
+            name='Login failed, credentials not valid',
+            value={'message': 'unauthorized'},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['401']
+        ),
+        OpenApiExample(
+            name='Bad request',
+            value={'message': 'Missing value for q'},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['400']
+        )
+    ],
+    "summary": "Full-text search of games"
+}
+
+get_game_facets_api_schema = {
+    "parameters": [
+        OpenApiParameter(
+            name='dimension',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Wymiary oddzielone przecinkami: genre, year_released, studio (domyślnie wszystkie)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='limit',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Maksymalna liczba najczęstszych wartości w każdym wymiarze',
+            required=False
+        )
+    ],
+    "responses": {
+        200: DummyFacetsResponseSerializer,
+        400: DummyResponseSerializer,
+        401: DummyResponseSerializer,
+    },
+    "examples": [
+        OpenApiExample(
+            name='Facet counts',
+            value={
+                "genre": [{"value": "RPG", "count": 1234}, {"value": "strategia", "count": 310}],
+                "year_released": [{"value": 1998, "count": 87}, {"value": 2000, "count": 64}],
+                "studio": [{"value": "BioWare", "count": 12}]
+            },
+            response_only=True,
+            media_type='application/json',
+            status_codes=['200']
+        ),
+        OpenApiExample(
+            name='Login failed, credentials not valid',
+            value={'message': 'unauthorized'},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['401']
+        ),
+        OpenApiExample(
+            name='Bad request',
+            value={'message': 'unknown facet dimension name'},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['400']
+        )
+    ],
+    "summary": "Game counts per genre, year and studio"
+}
+
+post_games_bulk_api_schema = {
+    "request": {
+        'application/json': CreateGameSerializer(many=True),
+        'application/x-ndjson': CreateGameSerializer,
+    },
+    "responses": {
+        200: DummyBulkResponseSerializer,
+        201: DummyBulkResponseSerializer,
+        400: DummyBulkResponseSerializer,
+        401: DummyResponseSerializer,
+    },
+    "examples": [
+        OpenApiExample(
+            name='All games added',
+            value={'created': 2, 'failed': 0, 'errors': []},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['201']
+        ),
+        OpenApiExample(
+            name='Some rows rejected',
+            value={
+                'created': 1,
+                'failed': 1,
+                'errors': [
+                    {'row': 2, 'errors': {'year_released': ['A valid integer is required.']}}
+                ]
+            },
+            response_only=True,
+            media_type='application/json',
+            status_codes=['200']
+        ),
+        OpenApiExample(
+            name='Login failed, credentials not valid',
+            value={'message': 'user not authenticated'},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['401']
+        )
+    ],
+    "summary": "Add many games from a JSON array or NDJSON body"
+}
+
+get_games_export_api_schema = {
+    "parameters": [
+        OpenApiParameter(
+            name='export_format',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Format eksportu: ndjson (domyślnie) lub csv',
+            required=False,
+            enum=['ndjson', 'csv']
+        ),
+        OpenApiParameter(
+            name='genre',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Gatunek gry',
+            required=False
+        ),
+        OpenApiParameter(
+            name='year_released',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Rok wydania gry',
+            required=False
+        )
+    ],
+    "responses": {
+        (200, 'application/x-ndjson'): OpenApiResponse(OpenApiTypes.STR, description='one game JSON object per line'),
+        (200, 'text/csv'): OpenApiResponse(OpenApiTypes.STR, description='id,name,year_released,genre,studio'),
+        (400, 'application/json'): DummyResponseSerializer,
+        (401, 'application/json'): DummyResponseSerializer,
+    },
+    "examples": [
+        OpenApiExample(
+            name='Bad request',
+            value={'message': 'unsupported export format xml'},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['400']
+        )
+    ],
+    "summary": "Stream all games as NDJSON or CSV"
 }
\ No newline at end of file
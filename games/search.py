@@ -0,0 +1,119 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router
+from django.db.models import Q
+
+from .models import Game
+
+FTS_TABLE = 'games_game_fts'
+
+# name, studio, genre column weights for bm25; lower scores rank first
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+CREATE_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, studio, genre,
+        content='games_game', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON games_game BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, studio, genre) VALUES (new.id, new.name, new.studio, new.genre);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON games_game BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, studio, genre) VALUES ('delete', old.id, old.name, old.studio, old.genre);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON games_game BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, studio, genre) VALUES ('delete', old.id, old.name, old.studio, old.genre);
+        INSERT INTO {FTS_TABLE}(rowid, name, studio, genre) VALUES (new.id, new.name, new.studio, new.genre);
+    END""",
+]
+
+def is_supported():
+    return connection.vendor == 'sqlite'
+
+
+def drop_search_triggers():
+    """Stop syncing the FTS table for a bulk load; rebuild_search_index() recreates the triggers and reindexes."""
+    with connection.cursor() as cursor:
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+
+
+def missing_search_triggers(using=DEFAULT_DB_ALIAS):
+    """Names of the FTS sync triggers that do not exist (all of them while games_game itself is missing)."""
+    names = [f'{FTS_TABLE}_{suffix}' for suffix in ('ai', 'ad', 'au')]
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'games_game'")
+        existing = {row[0] for row in cursor.fetchall()}
+    return [name for name in names if name not in existing]
+
+
+def rebuild_search_index(using=DEFAULT_DB_ALIAS):
+    """
+    (Re)create the FTS table and its sync triggers, then reindex every Game.
+    SQLite drops the triggers whenever a migration remakes games_game; the
+    post_migrate handler in signals.py calls this when they are missing.
+    """
+    with connections[using].cursor() as cursor:
+        for sql in CREATE_SQL:
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def build_match_query(query):
+    # every word becomes a quoted prefix term, so user input can never be FTS syntax
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class GameSearchResults:
+    """
+    Lazily evaluated, sliceable search result list so it can be handed to a
+    paginator: count() and each page are separate queries against the FTS index.
+    All of them run on one database, the matched ids are looked up where they
+    were found (a lagging replica would drop them).
+    """
+
+    def __init__(self, query):
+        self.match = build_match_query(query)
+        self.using = router.db_for_read(Game)
+
+    def is_supported(self):
+        return connections[self.using].vendor == 'sqlite'
+
+    def count(self):
+        if not self.match:
+            return 0
+        if not self.is_supported():
+            return self.fallback_queryset().count()
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [self.match])
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start = item.start or 0
+        limit = -1 if item.stop is None else max(item.stop - start, 0)
+        if not self.match or limit == 0:
+            return []
+        if not self.is_supported():
+            return list(self.fallback_queryset()[item])
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY bm25({FTS_TABLE}, %s, %s, %s), rowid LIMIT %s OFFSET %s',
+                [self.match, *BM25_WEIGHTS, limit, start]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        games = Game.objects.using(self.using).in_bulk(ids)
+        return [games[pk] for pk in ids if pk in games]
+
+    def fallback_queryset(self):
+        condition = Q()
+        for term in re.findall(r'\w+', self.match):
+            condition &= Q(name__icontains=term) | Q(studio__icontains=term) | Q(genre__icontains=term)
+        return Game.objects.using(self.using).filter(condition).order_by('id')
@@ -1,21 +1,84 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from .models import Game
+from utils.fieldsets import SparseFieldsMixin, parse_fields
 
 
-class GetGameSerializer(serializers.ModelSerializer):
+class GetGameSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Game
         fields = '__all__'
 
+class GameValuesSerializer:
+    """
+    Read-only fast path for GetGameSerializer: rows come straight from
+    queryset.values() in the serializer's field order with the same types, so
+    the rendered output is identical without building model instances or
+    running a to_representation per field.
+    """
+    fields = ('id', 'name', 'year_released', 'genre', 'studio')
+
+    @classmethod
+    def select(cls, params, name='fields'):
+        """Fields picked with ?fields= (sparse fieldset), all of them when the parameter is absent."""
+        return parse_fields(params, name, cls.fields) or cls.fields
+
+    @classmethod
+    def values(cls, queryset, fields=None, extra=()):
+        # extra columns are read for the caller (pagination keys, lookups) and dropped again by prune()
+        return queryset.values(*dict.fromkeys((*(fields or cls.fields), *extra)))
+
+    @staticmethod
+    def prune(rows, fields):
+        if not rows or len(rows[0]) == len(fields):
+            return rows
+        return [{field: row[field] for field in fields} for row in rows]
+
+    @classmethod
+    def from_related_row(cls, row, prefix, fields=None):
+        # nested game read through prefix__field lookups; a NULL foreign key renders as None like the nested serializer
+        if row[f'{prefix}__id'] is None:
+            return None
+        return {field: row[f'{prefix}__{field}'] for field in fields or cls.fields}
+
 class CreateGameSerializer(serializers.ModelSerializer):
     class Meta:
         model = Game
         fields = ['id', 'name', 'year_released', 'genre', 'studio']
 
+class GameBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False,
+        max_length=getattr(settings, 'GAMES_BATCH_MAX_SIZE', 1000), help_text='game ids, duplicates are returned once'
+    )
+
+class DummyGamesBatchResponseSerializer(serializers.Serializer):
+    games = GetGameSerializer(many=True, help_text='found games in the order of the requested ids')
+    not_found = serializers.ListField(child=serializers.IntegerField(), help_text='requested ids that do not exist')
+
 class DummyAuthApiRequestSerializer(serializers.Serializer):
     username = serializers.CharField(help_text='username')
     password = serializers.CharField(help_text='password')
 
 class DummyResponseSerializer(serializers.Serializer):
     message = serializers.CharField(help_text='response message')
+
+class DummyFacetValueSerializer(serializers.Serializer):
+    value = serializers.CharField(help_text='facet value (year_released values are integers)')
+    count = serializers.IntegerField(help_text='number of games with the value')
+
+class DummyFacetsResponseSerializer(serializers.Serializer):
+    genre = DummyFacetValueSerializer(many=True, required=False)
+    year_released = DummyFacetValueSerializer(many=True, required=False)
+    studio = DummyFacetValueSerializer(many=True, required=False)
+
+class DummyBulkRowErrorSerializer(serializers.Serializer):
+    row = serializers.IntegerField(help_text='row number in the request body')
+    errors = serializers.DictField(help_text='validation errors by field')
+
+class DummyBulkResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField(help_text='number of created games')
+    failed = serializers.IntegerField(help_text='number of rejected rows')
+    errors = DummyBulkRowErrorSerializer(many=True, help_text='rejected rows, the first 1000 are reported')
+    message = serializers.CharField(required=False, help_text='set when the body could not be parsed to the end')
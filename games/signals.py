@@ -0,0 +1,44 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from .catalog import bump_catalog_version
+from .facets import FACET_FIELDS, apply_facet_deltas, facet_deltas
+from .models import Game
+from .search import missing_search_triggers, rebuild_search_index
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def game_changed(sender, instance, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(pre_save, sender=Game)
+def remember_facet_values(sender, instance, using=None, **kwargs):
+    # the stored values are needed to move an updated game between facet values; loaddata
+    # (raw) saves carry their pk and may overwrite an existing row too
+    instance._facet_previous = None
+    if instance.pk is not None:
+        instance._facet_previous = Game.objects.using(using).filter(pk=instance.pk).values(*FACET_FIELDS).first()
+
+
+@receiver(post_save, sender=Game)
+def count_saved_game(sender, instance, using=None, **kwargs):
+    previous = getattr(instance, '_facet_previous', None)
+    apply_facet_deltas(facet_deltas(added=[instance], removed=[previous] if previous else []), using=using)
+
+
+@receiver(post_delete, sender=Game)
+def count_deleted_game(sender, instance, using=None, **kwargs):
+    apply_facet_deltas(facet_deltas(removed=[instance]), using=using)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # a migration that remakes games_game (AlterField etc. on SQLite) silently drops the FTS triggers
+    connection = connections[using]
+    if sender.label != 'games' or connection.vendor != 'sqlite':
+        return
+    if Game._meta.db_table in connection.introspection.table_names() and missing_search_triggers(using):
+        rebuild_search_index(using)
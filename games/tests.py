@@ -1,3 +1,592 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_migrate
+from django.http import QueryDict, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from . import generation
+from .bulk import ingest_games
+from .cache import games_list_cache
+from .catalog import check_catalog_cache
+from .facets import rebuild_facets
+from .loading import load_games
+from .models import Game, GameFacet
+from .pagination import GameCursorPagination
+from .serializers import GameBatchSerializer, GameValuesSerializer, GetGameSerializer
+from .search import FTS_TABLE, GameSearchResults, drop_search_triggers, missing_search_triggers
+from .views import filter_games
+from utils.authentication import token_cache
+from utils.testing import auth_headers, create_user
+
+
+class GameCursorPaginationTests(TestCase):
+    """Walking every page forward and back must visit each game once, in order, through index seeks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # few distinct years so pages break inside runs of equal year_released
+        Game.objects.bulk_create(
+            Game(name=f'Game {i}', year_released=1990 + i % 4, genre='RPG' if i % 3 else 'FPS', studio='Studio')
+            for i in range(95)
+        )
+
+    def setUp(self):
+        caches['default'].clear()
+        self.headers = auth_headers(create_user('walker'))
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            pages.append([game['id'] for game in response.json()['results']])
+            url = response.json()[link]
+        return pages
+
+    def test_walks_all_pages_both_ways(self):
+        for ordering, fields in GameCursorPagination.orderings.items():
+            for params in ['', '&genre=RPG', '&year_released=1991', '&genre=RPG&year_released=1991']:
+                with self.subTest(ordering=ordering, params=params):
+                    games = filter_games(Game.objects.all(), QueryDict(params.lstrip('&')))
+                    expected = list(games.order_by(*fields).values_list('id', flat=True))
+                    forward = self.walk(f'/games/?pagination=cursor&ordering={ordering}&page_size=3{params}', 'next')
+                    self.assertEqual([game_id for page in forward for game_id in page], expected)
+                    self.assertGreaterEqual(len(forward), 5)
+
+                    last = self.client.get(
+                        f'/games/?pagination=cursor&ordering={ordering}&page_size=3{params}', headers=self.headers
+                    )
+                    url = last.json()['next']
+                    while (page := self.client.get(url, headers=self.headers).json())['next']:
+                        url = page['next']
+                    backward = self.walk(page['previous'], 'previous')
+                    self.assertEqual(backward[::-1], forward[:-1])
+
+    def test_deep_page_seeks(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN is SQLite specific')
+        for ordering, fields in GameCursorPagination.orderings.items():
+            for reverse, operator in ((False, '>'), (True, '<')):
+                with self.subTest(ordering=ordering, reverse=reverse):
+                    position = [1993, 90][-len(fields):]
+                    games = Game.objects.filter(GameCursorPagination.keyset_filter(fields, position, reverse))
+                    plan = games.order_by(*fields).explain()
+                    self.assertRegex(plan, rf'SEARCH games_game USING .*\((rowid|{fields[0]}){operator}\?', plan)
+
+
+class GameQueryPlanTests(TestCase):
+    """Every filter and cursor ordering of GamesApi.get must be answered by an index seek, without a sort."""
+
+    filter_params = [
+        'genre=RPG',
+        'year_released=2000',
+        'genre=RPG&year_released=2000',
+    ]
+
+    def assert_uses_index(self, queryset):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN is SQLite specific')
+        plan = queryset.explain()
+        lines = [line for line in plan.splitlines() if 'games_game' in line]
+        self.assertTrue(lines, plan)
+        for line in lines:
+            # SCAN ... USING INDEX still reads the whole index
+            self.assertNotIn('SCAN', line, f'full scan in plan for {queryset.query}:\n{plan}')
+            self.assertRegex(line, r'SEARCH games_game USING (COVERING )?(INDEX|INTEGER PRIMARY KEY)', plan)
+        self.assertNotIn('USE TEMP B-TREE', plan, plan)
+
+    def test_filters_use_index(self):
+        for params in self.filter_params:
+            with self.subTest(params=params):
+                self.assert_uses_index(filter_games(Game.objects.all(), QueryDict(params)))
+
+    def page(self, ordering, params, cursor=True):
+        # the queryset GamesApi.get runs for the first page or for a page after a cursor
+        paginator = GameCursorPagination()
+        paginator.ordering = ordering
+        url = f'/games/?pagination=cursor&ordering={ordering}&{params}'
+        if cursor:
+            url += '&cursor=' + paginator.encode_cursor([2000, 1][-len(paginator.orderings[ordering]):], reverse=False)
+        request = Request(RequestFactory().get(url))
+        return paginator.get_page_queryset(filter_games(Game.objects.all(), request.query_params), request)
+
+    def test_cursor_orderings_use_index(self):
+        for ordering in GameCursorPagination.orderings:
+            # unfiltered first pages walk an index in order and stop at the LIMIT
+            for params, cursor in [*((params, cursor) for params in self.filter_params for cursor in (False, True)), ('', True)]:
+                with self.subTest(ordering=ordering, params=params, cursor=cursor):
+                    self.assert_uses_index(self.page(ordering, params, cursor))
+
+
+class GameSearchApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Game.objects.create(name='Other', studio='Studio', genre='Strategy', year_released=2000)
+        Game.objects.create(name='Strategy Master', studio='Studio', genre='FPS', year_released=2000)
+        Game.objects.create(name='Wiedźmin', studio='CD Projekt', genre='RPG', year_released=2007)
+        Game.objects.bulk_create(
+            Game(name=f'Racer {i}', studio='Speed', genre='Racing', year_released=2010) for i in range(12)
+        )
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 search is SQLite specific')
+        self.headers = auth_headers(create_user('searcher'))
+
+    def search(self, query, **params):
+        response = self.client.get('/games/search/', {'q': query, **params}, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_matches_word_prefixes_without_diacritics(self):
+        for query in ('wied', 'Wiedz', 'WIEDŹMIN', 'proj'):
+            with self.subTest(query=query):
+                self.assertEqual([game['name'] for game in self.search(query)['results']], ['Wiedźmin'])
+
+    def test_name_hits_rank_above_genre_hits(self):
+        self.assertEqual([game['name'] for game in self.search('strat')['results']], ['Strategy Master', 'Other'])
+
+    def test_pages_and_count(self):
+        first, second = self.search('racer'), self.search('racer', page=2)
+        self.assertEqual((first['count'], second['count']), (12, 12))
+        self.assertEqual((len(first['results']), len(second['results'])), (10, 2))
+        names = [game['name'] for game in first['results'] + second['results']]
+        self.assertEqual(sorted(names), sorted(f'Racer {i}' for i in range(12)))
+        self.assertIsNone(second['next'])
+
+    def test_punctuation_only_query_matches_nothing(self):
+        self.assertEqual(self.search('"*!? -')['results'], [])
+        self.assertEqual(self.client.get('/games/search/?q=%20', headers=self.headers).status_code, 400)
+
+
+class SearchTriggerTests(TestCase):
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 search is SQLite specific')
+
+    def test_migrate_recreates_dropped_triggers(self):
+        Game.objects.create(name='Baldur', studio='Larian', genre='RPG', year_released=2023)
+        drop_search_triggers()
+        self.assertEqual(len(missing_search_triggers()), 3)
+        Game.objects.create(name='Planescape', studio='Black Isle', genre='RPG', year_released=1999)
+        post_migrate.send(sender=apps.get_app_config('games'), app_config=apps.get_app_config('games'),
+                          verbosity=0, interactive=False, using='default', apps=apps, plan=[])
+        self.assertEqual(missing_search_triggers(), [])
+        # the rebuild also indexes rows written while the triggers were gone
+        self.assertEqual(GameSearchResults('planescape').count(), 1)
+        Game.objects.create(name='Torment', studio='inXile', genre='RPG', year_released=2017)
+        self.assertEqual(GameSearchResults('torment').count(), 1)
+
+
+class GameBulkApiTests(TestCase):
+
+    def setUp(self):
+        self.headers = auth_headers(create_user('loader'))
+
+    def test_truncated_array_keeps_parsed_rows(self):
+        body = '[{"name": "A", "studio": "S", "genre": "RPG", "year_released": 2000}, {"name": "B"}, {"name": "C", '
+        response = self.client.post('/games/bulk/', body, content_type='application/json', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual((report['created'], report['failed'], report['message']), (1, 1, 'invalid JSON at offset 85'))
+        self.assertEqual(report['errors'][0]['row'], 2)
+        self.assertEqual(list(Game.objects.values_list('name', flat=True)), ['A'])
+
+    def test_reported_errors_are_capped(self):
+        body = '\n'.join(['{"name": "bad"}'] * 5)
+        with mock.patch('games.views.GameBulkApi.max_reported_errors', 2):
+            response = self.client.post('/games/bulk/', body, content_type='application/x-ndjson', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((response.json()['failed'], len(response.json()['errors'])), (5, 2))
+
+
+class GameExportApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Game.objects.create(name='Wiedźmin', studio='CD Projekt', genre='RPG', year_released=2007)
+        Game.objects.create(name='Doom, "Eternal"', studio='id', genre='FPS', year_released=2020)
+        Game.objects.create(name='Gothic', studio='Piranha Bytes', genre='RPG', year_released=2001)
+
+    def setUp(self):
+        self.headers = auth_headers(create_user('exporter'))
+
+    def export(self, query=''):
+        response = self.client.get(f'/games/export/?{query}', headers=self.headers)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="games.ndjson"')
+        expected = list(Game.objects.order_by('id').values('id', 'name', 'year_released', 'genre', 'studio'))
+        self.assertEqual([json.loads(line) for line in body.splitlines()], expected)
+
+    def test_csv(self):
+        response, body = self.export('export_format=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], ['id', 'name', 'year_released', 'genre', 'studio'])
+        expected = Game.objects.order_by('id').values_list('id', 'name', 'year_released', 'genre', 'studio')
+        self.assertEqual(rows[1:], [[str(value) for value in game] for game in expected])
+
+    def test_filters(self):
+        _, body = self.export('genre=RPG')
+        self.assertEqual([json.loads(line)['name'] for line in body.splitlines()], ['Wiedźmin', 'Gothic'])
+        _, body = self.export('export_format=csv&genre=RPG&year_released=2001')
+        self.assertEqual([row[1] for row in csv.reader(io.StringIO(body))], ['name', 'Gothic'])
+
+    def test_unknown_format(self):
+        response = self.client.get('/games/export/?export_format=xml', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'message': 'unsupported export format xml'})
+
+
+class GameConditionalGetTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        token_cache.clear()
+        self.headers = auth_headers(create_user('validator'))
+        self.game = Game.objects.create(name='Game', studio='Studio', genre='RPG', year_released=2000)
+
+    def test_matching_etag_is_304_without_queries(self):
+        for path in ('/games/?genre=RPG', f'/games/{self.game.id}/', '/games/facets/'):
+            with self.subTest(path=path):
+                response = self.client.get(path, headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+                with self.assertNumQueries(0):
+                    # the token is cached and the version lives in the cache
+                    response = self.client.get(path, headers={**self.headers, 'If-None-Match': response['ETag']})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+
+    def test_write_changes_etag(self):
+        path = f'/games/{self.game.id}/'
+        etag = self.client.get(path, headers=self.headers)['ETag']
+        self.game.name = 'Renamed'
+        self.game.save()
+        response = self.client.get(path, headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'Renamed')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_differs_per_query(self):
+        first = self.client.get('/games/?genre=RPG', headers=self.headers)
+        second = self.client.get('/games/?genre=FPS', headers=self.headers)
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        response = self.client.get('/games/?genre=FPS', headers={**self.headers, 'If-None-Match': first['ETag']})
+        self.assertEqual(response.status_code, 200)
+
+    def test_per_process_cache_warns_on_deploy(self):
+        self.assertEqual([warning.id for warning in check_catalog_cache(None)], ['games.W001'])
+        with override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/games-test-cache'},
+        }, GAMES_CACHE_ALIAS='shared'):
+            self.assertEqual(check_catalog_cache(None), [])
+
+
+class GamesResponseCacheTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.headers = auth_headers(create_user('reader'))
+        Game.objects.create(name='Game', studio='Studio', genre='RPG', year_released=2000)
+
+    def test_counts_rendered_bytes_once_per_miss(self):
+        for path in ('/games/?genre=RPG', '/async/games/?genre=RPG'):
+            with self.subTest(path=path):
+                written = games_list_cache.stats()['bytes_written']
+                response = self.client.get(path, headers=self.headers)
+                self.assertEqual(games_list_cache.get(games_list_cache.key(response.wsgi_request)), response.json())
+                self.assertEqual(games_list_cache.stats()['bytes_written'], written + len(response.content))
+                # a hit is served from the cache and stores nothing
+                self.assertEqual(self.client.get(path, headers=self.headers).content, response.content)
+                self.assertEqual(games_list_cache.stats()['bytes_written'], written + len(response.content))
+
+
+class AsyncGamesApiTests(TestCase):
+    """The async views must answer with the same bytes as their sync counterparts."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.headers = auth_headers(create_user('async'))
+        self.game = Game.objects.create(name='Wiedźmin', studio='CD Projekt "RED"', genre='RPG', year_released=2007)
+        Game.objects.create(name='Doom', studio='id', genre='FPS', year_released=1993)
+
+    def test_same_bytes(self):
+        for path in ('/games/', '/games/?genre=RPG&page=1', '/games/?pagination=cursor&page_size=1',
+                     f'/games/{self.game.id}/', '/games/999999/', '/games/?fields=bogus'):
+            with self.subTest(path=path):
+                sync = self.client.get(path, headers=self.headers)
+                asynchronous = self.client.get(f'/async{path}', headers=self.headers)
+                self.assertEqual(asynchronous.status_code, sync.status_code)
+                self.assertEqual(asynchronous['Content-Type'], sync['Content-Type'])
+                # pagination links point back at the view that was asked
+                self.assertEqual(asynchronous.content.replace(b'/async/', b'/'), sync.content)
+
+    def test_not_modified(self):
+        for path in ('/async/games/?genre=RPG', f'/async/games/{self.game.id}/'):
+            with self.subTest(path=path):
+                response = self.client.get(path, headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+                response = self.client.get(path, headers={**self.headers, 'If-None-Match': response['ETag']})
+                self.assertEqual(response.status_code, 304)
+
+
+class GameValuesSerializerTests(TestCase):
+    """The values() fast path must render the same bytes as GetGameSerializer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Game.objects.create(name='Wiedźmin 3: Dziki Gon', studio='CD Projekt "RED"', genre='RPG', year_released=2015)
+        Game.objects.create(name='', studio='Studio', genre='FPS', year_released=-1)
+
+    def test_renders_identical_bytes(self):
+        for query in ('', 'fields=name,genre', 'fields=studio,id,year_released'):
+            with self.subTest(query=query):
+                fields = GameValuesSerializer.select(QueryDict(query))
+                games = Game.objects.order_by('id')
+                expected = JSONRenderer().render(GetGameSerializer(games, many=True, fields=fields).data)
+                self.assertEqual(JSONRenderer().render(list(GameValuesSerializer.values(games, fields))), expected)
+
+    def test_prune_drops_extra_columns(self):
+        games = Game.objects.order_by('id')
+        rows = list(GameValuesSerializer.values(games, ('name',), extra=('id', 'year_released')))
+        self.assertEqual(JSONRenderer().render(GameValuesSerializer.prune(rows, ('name',))),
+                         JSONRenderer().render(GetGameSerializer(games, many=True, fields=('name',)).data))
+
+
+class FacetDeltaTests(TestCase):
+    """The incrementally maintained GameFacet rows must always equal a full rebuild_facets()."""
+
+    def counts(self):
+        return {(dimension, value): count for dimension, value, count in GameFacet.objects.values_list('dimension', 'value', 'count')}
+
+    def assert_matches_rebuild(self, expected=None):
+        counts = self.counts()
+        rebuild_facets()
+        self.assertEqual(counts, self.counts())
+        if expected is not None:
+            self.assertEqual({key: count for key, count in counts.items() if key in expected}, expected)
+
+    def test_create(self):
+        Game.objects.create(name='A', studio='S1', genre='RPG', year_released=2000)
+        Game.objects.create(name='B', studio='S2', genre='RPG', year_released=2001)
+        self.assert_matches_rebuild({('genre', 'RPG'): 2, ('studio', 'S1'): 1, ('year_released', '2001'): 1})
+
+    def test_update_moves_between_values_and_drops_empty_ones(self):
+        game = Game.objects.create(name='A', studio='S1', genre='RPG', year_released=2000)
+        Game.objects.create(name='B', studio='S1', genre='FPS', year_released=2000)
+        game.genre, game.year_released = 'FPS', 2001
+        game.save()
+        self.assert_matches_rebuild({('genre', 'FPS'): 2, ('year_released', '2001'): 1, ('year_released', '2000'): 1})
+        self.assertFalse(GameFacet.objects.filter(dimension='genre', value='RPG').exists())
+
+    def test_update_without_facet_change_writes_no_facets(self):
+        game = Game.objects.create(name='A', studio='S1', genre='RPG', year_released=2000)
+        game.name = 'Renamed'
+        with self.assertNumQueries(2):
+            # the stored facet values and the UPDATE itself
+            game.save()
+        self.assert_matches_rebuild({('genre', 'RPG'): 1})
+
+    def test_delete(self):
+        first = Game.objects.create(name='A', studio='S1', genre='RPG', year_released=2000)
+        Game.objects.create(name='B', studio='S2', genre='RPG', year_released=2000)
+        first.delete()
+        self.assert_matches_rebuild({('genre', 'RPG'): 1, ('year_released', '2000'): 1})
+        self.assertFalse(GameFacet.objects.filter(dimension='studio', value='S1').exists())
+        Game.objects.all().delete()
+        self.assert_matches_rebuild()
+        self.assertEqual(self.counts(), {})
+
+    def test_bulk_ingest(self):
+        Game.objects.create(name='A', studio='S1', genre='RPG', year_released=2000)
+        records = [(row, {'name': f'G{row}', 'studio': f'S{row % 3}', 'genre': ('RPG', 'FPS')[row % 2], 'year_released': 2000 + row % 4}, None)
+                   for row in range(1, 26)]
+        report = ingest_games(records + [(26, {'name': 'bad'}, None)], chunk_size=10)
+        self.assertEqual((report['created'], report['failed']), (25, 1))
+        self.assert_matches_rebuild({('genre', 'RPG'): 13, ('genre', 'FPS'): 13})
+
+
+# the primary stands in for a replica: only the routing context matters here
+@override_settings(DATABASE_READ_REPLICAS=['default'])
+class ReplicaReadCacheTests(TestCase):
+    """Reads that may come from a lagging replica must not fill the response cache or get validators."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.headers = auth_headers(create_user('reader'))
+
+    def test_replica_read_is_not_cached(self):
+        response = self.client.get('/games/?genre=ZZZ', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+        self.assertIsNone(games_list_cache.get(games_list_cache.key(response.wsgi_request)))
+
+    def test_read_after_own_write_is_cached(self):
+        game = {'name': 'Game', 'year_released': 2000, 'genre': 'ZZZ', 'studio': 'Studio'}
+        response = self.client.post('/games/', game, content_type='application/json', headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        # sticky to the primary, so the response is safe to cache under the new catalog version
+        response = self.client.get('/games/?genre=ZZZ', headers=self.headers)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertIn('ETag', response)
+        self.assertEqual(games_list_cache.get(games_list_cache.key(response.wsgi_request))['count'], 1)
+
+
+class LoadGamesTests(TestCase):
+
+    def test_loads_fixture_objects_and_rows(self):
+        existing = Game.objects.create(name='Old', studio='Studio', genre='RPG', year_released=2000)
+        records = [
+            (1, {'model': 'games.game', 'pk': existing.pk, 'fields': {
+                'name': 'New', 'studio': 'Studio', 'genre': 'RPG', 'year_released': '2001'}}, None),
+            (2, {'name': 'Plain', 'studio': 'Studio', 'genre': 'FPS', 'year_released': 1999}, None),
+            (3, {'model': 'users.user', 'pk': 1, 'fields': {}}, None),
+            (4, {'name': 'No year', 'studio': 'Studio', 'genre': 'FPS'}, None),
+            (5, None, 'invalid JSON'),
+        ]
+        report = load_games(iter(records), batch_size=2)
+        self.assertEqual((report['processed'], report['loaded'], report['failed']), (5, 2, 3))
+        self.assertEqual([error['row'] for error in report['errors']], [3, 4, 5])
+        self.assertEqual(set(Game.objects.values_list('name', 'year_released')), {('New', 2001), ('Plain', 1999)})
+        self.assertEqual(GameFacet.objects.get(dimension='genre', value='FPS').count, 1)
+
+    def test_command_reads_ndjson(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as fixture:
+            for i in range(3):
+                fixture.write(json.dumps({'name': f'Game {i}', 'studio': 'Studio', 'genre': 'RPG', 'year_released': 2000}) + '\n')
+        self.addCleanup(os.unlink, fixture.name)
+        out = StringIO()
+        call_command('load_games', fixture.name, '--json', stdout=out, stderr=StringIO())
+        self.assertEqual(json.loads(out.getvalue())['loaded'], 3)
+        self.assertEqual(Game.objects.count(), 3)
+
+
+class GenerationTests(TestCase):
+
+    def test_returns_ids_of_inserted_games_after_deletes(self):
+        first, last = generation.generate_games(10)
+        Game.objects.filter(id__gt=last - 3).delete()
+        # ids of deleted rows are not reused, so the new range does not start at Max(id) + 1
+        first, last = generation.generate_games(3, seed=2)
+        self.assertEqual(list(Game.objects.filter(id__gte=first, id__lte=last).values_list('id', flat=True)),
+                         list(range(first, last + 1)))
+        self.assertEqual(Game.objects.filter(id__gt=last).count(), 0)
+        self.assertEqual(Game.objects.filter(id__gte=first).count(), 3)
+
+    def test_failed_load_restores_search_triggers(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 search is SQLite specific')
+        with mock.patch.object(generation, 'insert_rows', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                generation.generate_games(10)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f'{FTS_TABLE}_%'])
+            self.assertEqual(len(cursor.fetchall()), 3)
+
+
+class GameBatchApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.games = Game.objects.bulk_create(
+            Game(name=f'Game {i}', studio='Studio', genre='RPG', year_released=2000 + i) for i in range(3)
+        )
+
+    def setUp(self):
+        caches['default'].clear()
+        token_cache.clear()
+        self.headers = auth_headers(create_user('batch'))
+        # warm the token cache, so only the lookup itself is left
+        self.client.get('/games/batch/?ids=1', headers=self.headers)
+
+    def test_requested_order_without_duplicates(self):
+        first, second, third = (game.id for game in self.games)
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/games/batch/?ids={third},999999,{first},{third}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([game['id'] for game in data['games']], [third, first])
+        self.assertEqual(data['games'][0], GetGameSerializer(self.games[2]).data)
+        self.assertEqual(data['not_found'], [999999])
+
+    def test_post_body(self):
+        ids = [self.games[1].id, self.games[0].id, self.games[1].id]
+        response = self.client.post('/games/batch/?fields=name', {'ids': ids}, content_type='application/json', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'games': [{'name': 'Game 1'}, {'name': 'Game 0'}], 'not_found': []})
+
+    def test_invalid_ids(self):
+        for ids in ('', '1,x', '0', ',,'):
+            with self.subTest(ids=ids):
+                response = self.client.get(f'/games/batch/?ids={ids}', headers=self.headers)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('ids', response.json()['errors'])
+        response = self.client.post('/games/batch/', {'ids': []}, content_type='application/json', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_size_cap(self):
+        max_size = GameBatchSerializer().fields['ids'].max_length
+        ids = ','.join(str(i) for i in range(1, max_size + 2))
+        response = self.client.get(f'/games/batch/?ids={ids}', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ids', response.json()['errors'])
+        ids = ','.join(str(i) for i in range(1, max_size + 1))
+        self.assertEqual(self.client.get(f'/games/batch/?ids={ids}', headers=self.headers).status_code, 200)
+
+
+class GameFieldsApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Game.objects.bulk_create(
+            Game(name=f'Game {i:02}', studio='Studio', genre=('RPG', 'FPS')[i % 2], year_released=2020 - i) for i in range(25)
+        )
+
+    def setUp(self):
+        caches['default'].clear()
+        self.headers = auth_headers(create_user('sparse'))
+
+    def ids(self, query):
+        response = self.client.get(f'/games/?{query}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return [game['id'] for game in response.json()['results']]
+
+    def test_projection_does_not_change_page_contents(self):
+        for query in ('page=1', 'page=2', 'page=3', 'genre=RPG&page=2', 'year_released=2000'):
+            with self.subTest(query=query):
+                expected = self.ids(query)
+                self.assertEqual(self.ids(f'{query}&fields=id,year_released'), expected)
+                self.assertEqual(self.ids(f'{query}&fields=genre,id'), expected)
+
+    def test_payload_is_narrowed(self):
+        response = self.client.get('/games/?fields=year_released,name', headers=self.headers)
+        self.assertEqual(set(response.json()['results'][0]), {'name', 'year_released'})
+
+    def test_unknown_fields(self):
+        for path in ('/games/?fields=id,bogus', '/games/?fields=,', '/games/1/?fields=bogus',
+                     '/users/favorites/?fields=bogus', '/users/favorites/?game.fields=id,bogus'):
+            with self.subTest(path=path):
+                response = self.client.get(path, headers=self.headers)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('fields', response.json()['message'])
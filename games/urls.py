@@ -1,9 +1,17 @@
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = 'games'
 urlpatterns = [
     path('games/', views.GamesApi.as_view()),
     path('games/<int:id>/', views.GameApi.as_view()),
+    path('games/batch/', views.GameBatchApi.as_view()),
+    path('games/search/', views.GameSearchApi.as_view()),
+    path('games/facets/', views.GameFacetsApi.as_view()),
+    path('games/bulk/', views.GameBulkApi.as_view()),
+    path('games/export/', views.GameExportApi.as_view()),
+
+    path('async/games/', async_views.AsyncGamesApi.as_view()),
+    path('async/games/<int:id>/', async_views.AsyncGameApi.as_view()),
 ]
\ No newline at end of file
@@ -1,46 +1,66 @@
+from django.http import StreamingHttpResponse
 from django.utils.datastructures import MultiValueDictKeyError
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import status
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter
 
 
 from .models import Game
-from .schema_extensions import get_games_api_schema, post_games_api_schema, get_game_api_schema
-from .serializers import GetGameSerializer, CreateGameSerializer, DummyAuthApiRequestSerializer, DummyResponseSerializer
+from .pagination import GamePagination, GameCursorPagination
+from .bulk import ingest_games
+from .cache import games_list_cache
+from .catalog import catalog_etag, catalog_last_modified
+from .export import EXPORT_FORMATS, export_rows
+from .facets import FACET_FIELDS, get_facets
+from .search import GameSearchResults
+from .serializers import GetGameSerializer, CreateGameSerializer, GameBatchSerializer, GameValuesSerializer, \
+    DummyAuthApiRequestSerializer, DummyResponseSerializer
+from utils.instrumentation import timed
+from utils.schema import lazy_extend_schema
+from utils.streaming import iter_json_records
 from utils.utils import match_authenticated_user
 
-class GamePagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 25
+def filter_games(games, params):
+    if (genre := params.get('genre')) is not None:
+        games = games.filter(genre=genre)
+    if (year := params.get('year_released')) is not None:
+        games = games.filter(year_released=year)
+    return games
 
 class GamesApi(APIView):
     permission_classes = (IsAuthenticated,)
 
-    @extend_schema(**get_games_api_schema)
+    @lazy_extend_schema('games.schema_extensions.get_games_api_schema')
+    @method_decorator(condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified))
     def get(self, request):
         try:
             is_authenticated, user = match_authenticated_user(request)
             if is_authenticated:
-                games = Game.objects.all()
-
-                if request.data:
-                    params = request.query_params
-                    if params:
-                        if (genre := params.get('genre')) is not None and (year := params.get('year_released')) is not None:
-                            games = Game.objects.all().filter(genre=genre, year_released=year)
-                        elif (genre := params.get('genre')) is not None:
-                            games = Game.objects.all().filter(genre=genre)
-                        elif (year := params.get('year_released')) is not None:
-                            games = Game.objects.all().filter(year_released=year)
+                cache_key = games_list_cache.key(request)
+                if (data := games_list_cache.get(cache_key)) is not None:
+                    return Response(data)
 
-                paginator = GamePagination()
-                result_page = paginator.paginate_queryset(games, request)
-                serializer = GetGameSerializer(result_page, many=True)
-                return paginator.get_paginated_response(serializer.data)
+                games = filter_games(Game.objects.all(), request.query_params)
+                fields = GameValuesSerializer.select(request.query_params)
+
+                if GameCursorPagination.is_requested(request):
+                    paginator = GameCursorPagination()
+                    extra = paginator.key_fields()
+                else:
+                    # without an order the index chosen for the ?fields= projection decides what is on a page
+                    paginator = GamePagination()
+                    games, extra = games.order_by('id'), ()
+                result_page = paginator.paginate_queryset(GameValuesSerializer.values(games, fields, extra), request)
+                with timed('serialize'):
+                    response = paginator.get_paginated_response(GameValuesSerializer.prune(result_page, fields))
+                # stored once rendered, so the size comes from the response body instead of a second dumps
+                response.add_post_render_callback(
+                    lambda rendered: games_list_cache.set(cache_key, rendered.data, len(rendered.content))
+                )
+                return response
             else:
                 return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
         except MultiValueDictKeyError as e:
@@ -49,7 +69,7 @@ class GamesApi(APIView):
         except ValueError as e:
             return Response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
 
-    @extend_schema(**post_games_api_schema)
+    @lazy_extend_schema('games.schema_extensions.post_games_api_schema')
     def post(self, request):
         try:
             is_authenticated, user = match_authenticated_user(request)
@@ -69,14 +89,143 @@ class GamesApi(APIView):
 class GameApi(APIView):
     permission_classes = (IsAuthenticated,)
 
-    @extend_schema(**get_game_api_schema)
+    @lazy_extend_schema('games.schema_extensions.get_game_api_schema')
+    @method_decorator(condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified))
     def get(self, request, id):
         if match_authenticated_user(request):
             try:
-                game = Game.objects.get(pk=id)
-                serializer = GetGameSerializer(game)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                fields = GameValuesSerializer.select(request.query_params)
+                game = GameValuesSerializer.values(Game.objects.all(), fields).get(pk=id)
+                return Response(game, status=status.HTTP_200_OK)
             except Game.DoesNotExist:
                 return Response({'message': f'game with the id {id} does not exist'}, status=status.HTTP_404_NOT_FOUND)
+            except ValueError as e:
+                return Response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+
+class GameBatchApi(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @lazy_extend_schema('games.schema_extensions.get_games_batch_api_schema')
+    @method_decorator(condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified))
+    def get(self, request):
+        ids = request.query_params.get('ids', '')
+        return self.batch(request, {'ids': [game_id for game_id in ids.split(',') if game_id.strip()]})
+
+    @lazy_extend_schema('games.schema_extensions.post_games_batch_api_schema')
+    def post(self, request):
+        # same lookup with the ids in the body, for lists too long for a URL
+        return self.batch(request, request.data)
+
+    def batch(self, request, data):
+        is_authenticated, user = match_authenticated_user(request)
+        if is_authenticated:
+            try:
+                fields = GameValuesSerializer.select(request.query_params)
+            except ValueError as e:
+                return Response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = GameBatchSerializer(data=data)
+            if not serializer.is_valid():
+                return Response({'message': 'wrong input data', 'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+            ids = list(dict.fromkeys(serializer.validated_data['ids']))
+            # one IN query, the rows are put back in the requested order
+            rows = GameValuesSerializer.values(Game.objects.filter(pk__in=ids), fields, extra=('id',))
+            games = {game['id']: game for game in rows}
+            with timed('serialize'):
+                data = {
+                    'games': GameValuesSerializer.prune([games[game_id] for game_id in ids if game_id in games], fields),
+                    'not_found': [game_id for game_id in ids if game_id not in games],
+                }
+            return Response(data, status=status.HTTP_200_OK)
         else:
             return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+
+class GameSearchApi(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @lazy_extend_schema('games.schema_extensions.get_game_search_api_schema')
+    def get(self, request):
+        try:
+            is_authenticated, user = match_authenticated_user(request)
+            if is_authenticated:
+                query = request.query_params['q']
+                if not query.strip():
+                    return Response({'message': 'Missing value for q'}, status=status.HTTP_400_BAD_REQUEST)
+                paginator = GamePagination()
+                result_page = paginator.paginate_queryset(GameSearchResults(query), request)
+                with timed('serialize'):
+                    data = GetGameSerializer(result_page, many=True).data
+                return paginator.get_paginated_response(data)
+            else:
+                return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+        except MultiValueDictKeyError as e:
+            message = 'Missing value for ' + e.args[0]
+            return Response({'message': message}, status=status.HTTP_400_BAD_REQUEST)
+
+class GameFacetsApi(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @lazy_extend_schema('games.schema_extensions.get_game_facets_api_schema')
+    @method_decorator(condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified))
+    def get(self, request):
+        is_authenticated, user = match_authenticated_user(request)
+        if is_authenticated:
+            dimensions = request.query_params.get('dimension')
+            dimensions = tuple(dict.fromkeys(dimensions.split(','))) if dimensions else FACET_FIELDS
+            for dimension in dimensions:
+                if dimension not in FACET_FIELDS:
+                    return Response({'message': f'unknown facet dimension {dimension}'}, status=status.HTTP_400_BAD_REQUEST)
+            limit = request.query_params.get('limit')
+            if limit is not None:
+                if not limit.isdigit() or int(limit) < 1:
+                    return Response({'message': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+                limit = int(limit)
+            with timed('serialize'):
+                data = get_facets(dimensions, limit)
+            return Response(data, status=status.HTTP_200_OK)
+        else:
+            return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+
+class GameBulkApi(APIView):
+    permission_classes = (IsAuthenticated,)
+    chunk_size = 1000
+    max_reported_errors = 1000
+
+    @lazy_extend_schema('games.schema_extensions.post_games_bulk_api_schema')
+    def post(self, request):
+        # the body is read straight from the request stream, request.data would load it whole
+        is_authenticated, user = match_authenticated_user(request)
+        if is_authenticated:
+            if request.stream is None:
+                return Response({'message': 'missing POST data'}, status=status.HTTP_400_BAD_REQUEST)
+            records = iter_json_records(request.stream, request.content_type)
+            report = ingest_games(records, self.chunk_size, self.max_reported_errors)
+            if not report['created']:
+                return Response(report, status=status.HTTP_400_BAD_REQUEST)
+            if report['failed'] or 'message' in report:
+                return Response(report, status=status.HTTP_200_OK)
+            return Response(report, status=status.HTTP_201_CREATED)
+        else:
+            return Response({'message': 'user not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
+
+class GameExportApi(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @lazy_extend_schema('games.schema_extensions.get_games_export_api_schema')
+    def get(self, request):
+        try:
+            is_authenticated, user = match_authenticated_user(request)
+            if is_authenticated:
+                export_format = request.query_params.get('export_format', 'ndjson')
+                if export_format not in EXPORT_FORMATS:
+                    return Response({'message': f'unsupported export format {export_format}'}, status=status.HTTP_400_BAD_REQUEST)
+                content_type, render = EXPORT_FORMATS[export_format]
+                games = filter_games(Game.objects.all(), request.query_params)
+                response = StreamingHttpResponse(render(export_rows(games)), content_type=content_type)
+                response['Content-Disposition'] = f'attachment; filename="games.{export_format}"'
+                return response
+            else:
+                return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+        except ValueError as e:
+            return Response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
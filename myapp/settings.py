@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
+import sys
 
 from pathlib import Path
 from dotenv import load_dotenv
@@ -32,6 +33,14 @@ DEBUG = True
 ALLOWED_HOSTS = []
 
 
+# API documentation: workers started with API_DOCS=0 leave out the docs-only apps
+# and the /schema/ and /swagger/ routes. With SCHEMA_LAZY the view schema
+# decorations (utils.schema.lazy_extend_schema) are attached when a schema is
+# built instead of at import, so API workers never import drf_spectacular.
+API_DOCS = os.getenv('API_DOCS', '1') == '1'
+SCHEMA_LAZY = os.getenv('SCHEMA_LAZY', '1') == '1'
+
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -45,11 +54,17 @@ INSTALLED_APPS = [
     'rest_framework.authtoken',
     'games.apps.GamesConfig',
     'users.apps.UsersConfig',
-    "drf_spectacular",
-    "drf_spectacular_sidecar",
 ]
 
+if API_DOCS:
+    INSTALLED_APPS += [
+        "drf_spectacular",
+        "drf_spectacular_sidecar",
+    ]
+
 MIDDLEWARE = [
+    'utils.instrumentation.PerformanceMiddleware',
+    'utils.replicas.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,6 +104,74 @@ DATABASES = {
     }
 }
 
+# Opt-in SQLite production profile, enabled with DATABASE_PROFILE=production.
+# WAL lets readers run while a writer commits, synchronous=NORMAL is durable
+# across application crashes in WAL mode (only an OS crash can lose the last
+# commits), busy_timeout makes writers queue instead of failing with "database
+# is locked" and IMMEDIATE transactions take the write lock up front so a read
+# transaction never has to be upgraded mid-way. Connections are reused for
+# SQLITE_PRODUCTION_CONN_MAX_AGE seconds so the pragmas run once per connection,
+# not once per request. `manage.py benchmark_sqlite` compares both profiles.
+SQLITE_PRODUCTION_OPTIONS = {
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA busy_timeout=5000',
+        # negative cache_size is in KiB: 64 MiB page cache per connection
+        'PRAGMA cache_size=-65536',
+        'PRAGMA mmap_size=268435456',
+        'PRAGMA temp_store=MEMORY',
+    ]),
+}
+SQLITE_PRODUCTION_CONN_MAX_AGE = int(os.getenv('DATABASE_CONN_MAX_AGE', 600))
+
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'default')
+if DATABASE_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': SQLITE_PRODUCTION_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': SQLITE_PRODUCTION_OPTIONS,
+    })
+
+# Read replicas: DATABASE_REPLICAS is a comma separated list of database files
+# (copies of the primary, refreshed with `manage.py sync_replicas`). GET/HEAD/OPTIONS
+# requests read from them, everything else and a client's requests for
+# DATABASE_REPLICA_STICKY_SECONDS after its last write use the primary. The
+# stickiness marks live in the default cache, which has to be shared between workers
+# (system check replicas.E001). Replica reads are neither cached nor given ETags.
+DATABASE_READ_REPLICAS = []
+for number, name in enumerate(filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{number}'] = {**DATABASES['default'], 'NAME': name.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_READ_REPLICAS.append(f'replica{number}')
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv('DATABASE_REPLICA_STICKY_SECONDS', 5))
+DATABASE_ROUTERS = ['utils.replicas.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Holds the games catalog version, cached game listings and the read replica
+# stickiness marks. Local memory is per process, so it is only correct with a
+# single worker; for several workers on one host set CACHE_DIR to use the file
+# based backend (`check --deploy` warns, games.W001; DATABASE_REPLICAS requires it).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+if CACHE_DIR := os.getenv('CACHE_DIR'):
+    CACHES['default'].update({
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+    })
+
+GAMES_CACHE_ALIAS = 'default'
+GAMES_RESPONSE_CACHE_TIMEOUT = 3600
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -135,9 +218,32 @@ APPEND_SLASH = False
 
 AUTH_USER_MODEL = 'users.User'
 
+# In-process cache of resolved auth tokens, shared by CachedTokenAuthentication
+# and match_authenticated_user. Set the size to 0 to disable it.
+AUTH_TOKEN_CACHE_MAX_SIZE = 10000
+AUTH_TOKEN_CACHE_TTL = 60
+
+# Expiring multi-session tokens (users.AuthToken). A login reuses a token with at
+# least AUTH_TOKEN_REUSE_MIN_REMAINING seconds left instead of writing a new one;
+# last_used is flushed in batches every AUTH_TOKEN_LAST_USED_FLUSH_INTERVAL seconds.
+# Expired tokens are removed by `manage.py purge_expired_tokens`.
+AUTH_TOKEN_LIFETIME = 14 * 24 * 60 * 60
+AUTH_TOKEN_REUSE_MIN_REMAINING = 24 * 60 * 60
+AUTH_TOKEN_LAST_USED_FLUSH_INTERVAL = 60
+
+# Upper bound of game ids per list in POST /users/favorites/batch/
+FAVORITES_BATCH_MAX_SIZE = 1000
+
+# Upper bound of game ids per /games/batch/ request
+GAMES_BATCH_MAX_SIZE = 1000
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'utils.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.instrumentation.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
@@ -147,4 +253,35 @@ SPECTACULAR_SETTINGS = {
     'DESCRIPTION': 'Documentation of test project of Games API',
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
+    'DEFAULT_GENERATOR_CLASS': 'utils.schema_generator.SchemaGenerator',
+}
+
+# /schema/ serves the OpenAPI document built once per process. Outside DEBUG the
+# files written by `manage.py build_schema` are used when they exist for VERSION.
+SCHEMA_ARTIFACT_DIR = BASE_DIR / 'openapi'
+SCHEMA_CACHE_MAX_AGE = 60
+
+# Per-request performance instrumentation (utils.instrumentation.PerformanceMiddleware):
+# share of requests measured, Server-Timing response header and JSON log lines
+PERFORMANCE_SAMPLE_RATE = float(os.getenv('PERFORMANCE_SAMPLE_RATE', '1.0' if DEBUG else '0.01'))
+PERFORMANCE_SERVER_TIMING = True
+PERFORMANCE_LOG = True
+# `manage.py test` would print a log line for every request of the suite
+PERFORMANCE_LOG_LEVEL = 'WARNING' if sys.argv[1:2] == ['test'] else 'INFO'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'performance': {
+            'handlers': ['console'],
+            'level': PERFORMANCE_LOG_LEVEL,
+            'propagate': False,
+        },
+    },
 }
@@ -1,14 +1,19 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-)
-urlpatterns = [
-    path("schema/", SpectacularAPIView.as_view(), name="schema"),
-    path("swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
 
+urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include("games.urls")),
     path('', include("users.urls")),
 ]
+
+if settings.API_DOCS:
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    from utils.schema import CachedSchemaView
+
+    urlpatterns = [
+        path("schema/", CachedSchemaView.as_view(), name="schema"),
+        path("swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
+    ] + urlpatterns
@@ -0,0 +1,54 @@
+from rest_framework import status
+
+from .models import Favorites
+from .pagination import FavoriteCursorPagination
+from .serializers import FavoriteValuesSerializer, GetFavoritesSerializer
+from games.models import Game
+from utils.async_views import AsyncAPIView, json_response
+from utils.instrumentation import timed
+
+
+class AsyncFavoritesApi(AsyncAPIView):
+
+    async def get(self, request, id=None):
+        # id from the request is the favorite id
+        try:
+            fields, game_fields = FavoriteValuesSerializer.select(request.query_params)
+            favorite = await GetFavoritesSerializer.project(Favorites.objects.all(), fields, game_fields).aget(pk=id)
+            if favorite.user_id == request.user.id:
+                with timed('serialize'):
+                    data = GetFavoritesSerializer(favorite, fields=fields, game_fields=game_fields).data
+                return json_response(data)
+            else:
+                return json_response({'message': f'favorite with id {id} does not belong to authenticated user'}, status=status.HTTP_403_FORBIDDEN)
+        except Favorites.DoesNotExist:
+            return json_response({'message': 'Favorites not found'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return json_response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+    async def post(self, request, id=None):
+        # id from the request is the game id that should be added for the user
+        user = request.user
+        added = await Favorites.objects.aadd(user.id, [id])
+        if id in added:
+            return json_response({'id': added[id], 'game': id, 'user': user.id}, status=status.HTTP_201_CREATED)
+
+        game = await Game.objects.filter(pk=id).only('name').afirst()
+        if game is None:
+            return json_response({'message': f'game with the id {id} does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        return json_response({'message': f'game {game.name} already added to favorites'})
+
+
+class AsyncFavoriteAPI(AsyncAPIView):
+
+    async def get(self, request):
+        try:
+            fields, game_fields = FavoriteValuesSerializer.select(request.query_params)
+            favorites = FavoriteValuesSerializer.values(Favorites.objects.filter(user=request.user), fields, game_fields)
+            if FavoriteCursorPagination.is_requested(request):
+                paginator = FavoriteCursorPagination()
+                result_page = await paginator.apaginate_queryset(favorites, request)
+                return json_response(paginator.get_paginated_response(FavoriteValuesSerializer.many(result_page, fields, game_fields)).data)
+            return json_response(FavoriteValuesSerializer.many([favorite async for favorite in favorites], fields, game_fields))
+        except ValueError as e:
+            return json_response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,17 @@
+"""
+Password hashing for process pool workers. This module must not import models
+at import time: spawned workers (macOS, Windows) unpickle these functions before
+Django is set up.
+"""
+import os
+
+
+def init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def hash_passwords(passwords):
+    from django.contrib.auth.hashers import make_password
+    return [make_password(password) for password in passwords]
@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+
+from .hashing import hash_passwords, init_worker
+from .models import User
+from .serializers import ImportUserSerializer
+from utils.streaming import ImportReport, chunked
+
+
+def hash_in_pool(pool, passwords, workers):
+    if pool is None:
+        return hash_passwords(passwords)
+    size = -(-len(passwords) // workers)
+    hashed = []
+    for part in pool.map(hash_passwords, [passwords[i:i + size] for i in range(0, len(passwords), size)]):
+        hashed.extend(part)
+    return hashed
+
+
+def import_users(records, chunk_size=1000, workers=None, max_reported_errors=1000, progress=None):
+    """
+    Validate (row_number, value, error) records chunk by chunk, drop usernames
+    and emails that already exist (in the database or earlier in the chunk),
+    hash the remaining passwords across a process pool and insert them with
+    bulk_create, one transaction per chunk. workers=0 hashes in-process.
+    progress, if given, is called with the report after every chunk.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    report = ImportReport(max_reported_errors, processed=0, created=0)
+
+    serializer = ImportUserSerializer()
+    pool = None
+    if workers:
+        pool = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(os.environ.get('DJANGO_SETTINGS_MODULE'),))
+    with pool or nullcontext():
+        for chunk in chunked(report.guarded(records), chunk_size):
+            report['processed'] += len(chunk)
+            candidates = []
+            for row, value, error in chunk:
+                if error is not None:
+                    report.add_error(row, {'non_field_errors': [error]})
+                    continue
+                if not isinstance(value, dict):
+                    report.add_error(row, {'non_field_errors': ['expected an object']})
+                    continue
+                try:
+                    candidates.append((row, serializer.run_validation(value)))
+                except ValidationError as e:
+                    report.add_error(row, e.detail)
+
+            candidates = drop_duplicates(candidates, report.add_error)
+            if candidates:
+                hashed = hash_in_pool(pool, [data['password'] for _, data in candidates], workers)
+                rows = [(row, {**data, 'password': password}) for (row, data), password in zip(candidates, hashed)]
+                report['created'] += insert_users(rows, report.add_error)
+            if progress is not None:
+                progress(report)
+    return report
+
+
+def drop_duplicates(candidates, add_error):
+    usernames = {data['username'] for _, data in candidates}
+    emails = {data['email'] for _, data in candidates}
+    taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+    taken_emails = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+    unique = []
+    for row, data in candidates:
+        errors = {}
+        if data['username'] in taken_usernames:
+            errors['username'] = ['user with this username already exists']
+        if data['email'] in taken_emails:
+            errors['email'] = ['user with this email address already exists']
+        if errors:
+            add_error(row, errors)
+            continue
+        taken_usernames.add(data['username'])
+        taken_emails.add(data['email'])
+        unique.append((row, data))
+    return unique
+
+
+def insert_users(rows, add_error):
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([User(**data) for _, data in rows])
+        return len(rows)
+    except IntegrityError:
+        pass
+    # a concurrent write took one of the names since the duplicate check, find the offending rows
+    created = 0
+    for row, data in rows:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([User(**data)])
+            created += 1
+        except IntegrityError:
+            add_error(row, {'non_field_errors': ['username or email already exists']})
+    return created
@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.imports import import_users
+from utils.streaming import iter_csv_records, iter_json_records, iter_ndjson
+
+FORMATS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream users (username, password, email, first_name, last_name) from a CSV, JSON array '
+        'or NDJSON file, hash the passwords across a process pool and insert them with bulk_create '
+        'in transactional batches. Rows with invalid data or a username/email that already exists '
+        'are reported and skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="file to import, '-' reads standard input")
+        parser.add_argument('--format', choices=['csv', 'json', 'ndjson'], help='input format, defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000, help='rows validated, hashed and inserted together')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='hashing processes, 0 hashes in-process')
+        parser.add_argument('--max-errors', type=int, default=1000, help='rejected rows listed in the report')
+        parser.add_argument('--json', action='store_true', help='print the final report as JSON')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or FORMATS.get(os.path.splitext(path)[1].lower())
+        if file_format is None:
+            raise CommandError('cannot tell the input format from the file name, pass --format')
+        try:
+            stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        except OSError as e:
+            raise CommandError(f'cannot read {path}: {e}')
+
+        if file_format == 'csv':
+            records = iter_csv_records(stream)
+        elif file_format == 'ndjson':
+            records = iter_ndjson(stream)
+        else:
+            records = iter_json_records(stream)
+
+        started = time.perf_counter()
+
+        def progress(report):
+            elapsed = time.perf_counter() - started
+            self.stderr.write(
+                f"{report['processed']} rows, {report['created']} created, {report['failed']} rejected, "
+                f"{report['processed'] / elapsed:,.0f} rows/s"
+            )
+
+        try:
+            report = import_users(
+                records, chunk_size=options['batch_size'], workers=options['workers'],
+                max_reported_errors=options['max_errors'], progress=progress
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+        report['seconds'] = time.perf_counter() - started
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for error in report['errors']:
+            details = '; '.join(f'{field}: {" ".join(map(str, messages))}' for field, messages in error['errors'].items())
+            self.stdout.write(f"row {error['row']}: {details}")
+        if 'message' in report:
+            self.stdout.write(self.style.ERROR(f"stopped early: {report['message']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"imported {report['created']} of {report['processed']} users in {report['seconds']:.1f}s, "
+            f"{report['failed']} rejected"
+        ))
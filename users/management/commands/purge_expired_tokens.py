@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.models import AuthToken
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired auth tokens in batches. Run it from cron, or with --interval as a '
+        'long-running background sweep.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='tokens deleted per statement')
+        parser.add_argument('--interval', type=float, help='keep running and sweep every INTERVAL seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = self.purge(options['batch_size'])
+            self.stdout.write(f'deleted {deleted} expired tokens')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    @staticmethod
+    def purge(batch_size):
+        # short batches keep each write transaction (and SQLite's write lock) brief
+        deleted = 0
+        while True:
+            keys = list(AuthToken.objects.expired().values_list('key', flat=True)[:batch_size])
+            if not keys:
+                return deleted
+            AuthToken.objects.filter(key__in=keys).delete()
+            deleted += len(keys)
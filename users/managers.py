@@ -1,4 +1,10 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import BaseUserManager
+from asgiref.sync import sync_to_async
+from django.db import connections, models, router, transaction
+from django.utils import timezone
 
 
 class CustomUserManager(BaseUserManager):
@@ -13,4 +19,74 @@ class CustomUserManager(BaseUserManager):
         user.set_password(password)
 
         user.save(using=self._db)
-        return user
\ No newline at end of file
+        return user
+
+class AuthTokenManager(models.Manager):
+    def expired(self, now=None):
+        return self.filter(expires__lte=now or timezone.now())
+
+    def issue(self, user):
+        """
+        Return a valid token for the user, reusing the newest one that still has
+        at least AUTH_TOKEN_REUSE_MIN_REMAINING seconds left, so a repeated login
+        is a single read. Only when there is none a new token is inserted; other
+        sessions of the user keep their tokens.
+        """
+        now = timezone.now()
+        min_remaining = timedelta(seconds=getattr(settings, 'AUTH_TOKEN_REUSE_MIN_REMAINING', 24 * 60 * 60))
+        token = self.filter(user=user, expires__gt=now + min_remaining).order_by('-expires').first()
+        if token is None:
+            token = self.create(user=user)
+        return token
+
+
+class FavoritesManager(models.Manager):
+    def add(self, user_id, game_ids):
+        """
+        Add the existing games among game_ids to the user's favorites with a
+        single INSERT ... SELECT ... ON CONFLICT DO NOTHING statement, relying on
+        the (user, game) unique constraint. Returns {game_id: favorite_id} for the
+        rows actually inserted; missing games and existing favorites are skipped.
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        if not game_ids:
+            return {}
+        db = self._db or router.db_for_write(self.model)
+        connection = connections[db]
+        # ON CONFLICT is SQLite/PostgreSQL syntax, RETURNING needs SQLite 3.35+
+        if connection.vendor not in ('sqlite', 'postgresql') or not connection.features.can_return_rows_from_bulk_insert:
+            return self._add_with_orm(user_id, game_ids, db)
+        qn = connection.ops.quote_name
+        opts = self.model._meta
+        game_field, user_field = opts.get_field('game'), opts.get_field('user')
+        game_opts = game_field.related_model._meta
+        sql = (
+            f'INSERT INTO {qn(opts.db_table)} ({qn(game_field.column)}, {qn(user_field.column)}) '
+            f'SELECT {qn(game_opts.pk.column)}, %s FROM {qn(game_opts.db_table)} '
+            f'WHERE {qn(game_opts.pk.column)} IN ({", ".join(["%s"] * len(game_ids))}) '
+            f'ON CONFLICT DO NOTHING RETURNING {qn(opts.pk.column)}, {qn(game_field.column)}'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [user_id, *game_ids])
+            return {game_id: favorite_id for favorite_id, game_id in cursor.fetchall()}
+
+    async def aadd(self, user_id, game_ids):
+        return await sync_to_async(self.add)(user_id, game_ids)
+
+    def _add_with_orm(self, user_id, game_ids, db):
+        game_model = self.model._meta.get_field('game').related_model
+        favorites = self.using(db)
+        with transaction.atomic(using=db):
+            existing = set(game_model.objects.using(db).filter(pk__in=game_ids).values_list('pk', flat=True))
+            existing -= set(favorites.filter(user_id=user_id, game_id__in=existing).values_list('game_id', flat=True))
+            favorites.bulk_create([self.model(user_id=user_id, game_id=game_id) for game_id in existing], ignore_conflicts=True)
+            return dict(favorites.filter(user_id=user_id, game_id__in=existing).values_list('game_id', 'id'))
+
+    def remove(self, user_id, game_ids):
+        """Remove the given games from the user's favorites and return the game ids that were removed."""
+        db = self._db or router.db_for_write(self.model)
+        favorites = self.using(db).filter(user_id=user_id, game_id__in=game_ids)
+        with transaction.atomic(using=db):
+            removed = list(favorites.values_list('game_id', flat=True))
+            favorites.delete()
+        return removed
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:41
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_legacy_tokens(apps, schema_editor):
+    # carry over the single-token-per-user rest_framework.authtoken keys so existing sessions stay valid
+    Token = apps.get_model('authtoken', 'Token')
+    AuthToken = apps.get_model('users', 'AuthToken')
+    db_alias = schema_editor.connection.alias
+    expires = timezone.now() + timedelta(seconds=getattr(settings, 'AUTH_TOKEN_LIFETIME', 14 * 24 * 60 * 60))
+    AuthToken.objects.using(db_alias).bulk_create(
+        (AuthToken(key=token.key, user_id=token.user_id, expires=expires)
+         for token in Token.objects.using(db_alias).iterator()),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_favorites'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthToken',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False, verbose_name='key')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='created')),
+                ('expires', models.DateTimeField(db_index=True, verbose_name='expires')),
+                ('last_used', models.DateTimeField(blank=True, null=True, verbose_name='last_used')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='auth_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'expires'], name='users_token_user_expires_idx')],
+            },
+        ),
+        migrations.RunPython(copy_legacy_tokens, migrations.RunPython.noop),
+    ]
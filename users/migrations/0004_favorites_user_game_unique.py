@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:45
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_favorites(apps, schema_editor):
+    # keep the oldest row of every (user, game) pair so the unique constraint can be created
+    Favorites = apps.get_model('users', 'Favorites')
+    db_alias = schema_editor.connection.alias
+    first_ids = Favorites.objects.using(db_alias).values('user_id', 'game_id').annotate(first_id=Min('id')).values('first_id')
+    Favorites.objects.using(db_alias).exclude(id__in=first_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_game_search'),
+        ('users', '0003_authtoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_favorites, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='favorites',
+            constraint=models.UniqueConstraint(fields=('user', 'game'), name='users_favorites_user_game_uniq'),
+        ),
+    ]
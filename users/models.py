@@ -1,7 +1,13 @@
+import binascii
+import os
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser
 
-from.managers import CustomUserManager
+from.managers import AuthTokenManager, CustomUserManager, FavoritesManager
 from games.models import Game
 
 class User(AbstractBaseUser):
@@ -21,4 +27,48 @@ class User(AbstractBaseUser):
 
 class Favorites(models.Model):
     game = models.ForeignKey(Game, null=True, on_delete=models.PROTECT)
-    user = models.ForeignKey(User, null=True, on_delete=models.PROTECT)
\ No newline at end of file
+    user = models.ForeignKey(User, null=True, on_delete=models.PROTECT)
+
+    objects = FavoritesManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'game'], name='users_favorites_user_game_uniq'),
+        ]
+
+class AuthToken(models.Model):
+    """
+    Expiring API token. A user can hold several at once (one per session or
+    device); expired ones are removed by the purge_expired_tokens command.
+    last_used is written in batches by utils.authentication.token_usage.
+    """
+    key = models.CharField('key', max_length=40, primary_key=True)
+    user = models.ForeignKey(User, related_name='auth_tokens', on_delete=models.CASCADE)
+    created = models.DateTimeField('created', auto_now_add=True)
+    expires = models.DateTimeField('expires', db_index=True)
+    last_used = models.DateTimeField('last_used', null=True, blank=True)
+
+    objects = AuthTokenManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'expires'], name='users_token_user_expires_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = self.generate_key()
+        if not self.expires:
+            self.expires = timezone.now() + timedelta(seconds=getattr(settings, 'AUTH_TOKEN_LIFETIME', 14 * 24 * 60 * 60))
+        return super().save(*args, **kwargs)
+
+    @classmethod
+    def generate_key(cls):
+        return binascii.hexlify(os.urandom(20)).decode()
+
+    @property
+    def is_expired(self):
+        return self.expires <= timezone.now()
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,6 @@
+from utils.pagination import KeysetPagination
+
+
+class FavoriteCursorPagination(KeysetPagination):
+    page_size = 25
+    max_page_size = 100
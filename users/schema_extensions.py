@@ -1,7 +1,26 @@
-from drf_spectacular.utils import OpenApiExample
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter
 
 from users.serializers import DummyAuthApiRequestSerializer, DummyResponseSerializer, \
-    DummyAuthRegisterRequestSerializer, GetFavoritesSerializer, CreateFavoriteSerializer
+    DummyAuthRegisterRequestSerializer, GetFavoritesSerializer, CreateFavoriteSerializer, FavoritesBatchSerializer, \
+    DummyFavoritesBatchResponseSerializer
+
+favorite_fields_parameters = [
+    OpenApiParameter(
+        name='fields',
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description='Pola ulubionej oddzielone przecinkami: id, game, user (domyślnie wszystkie); nieznane pole zwraca błąd 400',
+        required=False
+    ),
+    OpenApiParameter(
+        name='game.fields',
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description='Pola zagnieżdżonej gry oddzielone przecinkami: id, name, year_released, genre, studio '
+                    '(domyślnie wszystkie)',
+        required=False
+    )
+]
 
 auth_api_schema = {
     "request": DummyAuthApiRequestSerializer,
@@ -71,6 +90,7 @@ auth_api_registration_schema = {
 
 get_favorites_api_schema = {
     "request": GetFavoritesSerializer,
+    "parameters": favorite_fields_parameters,
     "responses": {
         200: GetFavoritesSerializer,
         400: DummyResponseSerializer,
@@ -125,9 +145,11 @@ get_favorites_api_schema = {
 post_favorites_api_schema = {
     "request": CreateFavoriteSerializer,
     "responses": {
+        200: DummyResponseSerializer,
         201: DummyResponseSerializer,
         400: DummyResponseSerializer,
         401: DummyResponseSerializer,
+        404: DummyResponseSerializer,
     },
     "examples": [
         OpenApiExample(
@@ -148,6 +170,13 @@ post_favorites_api_schema = {
             media_type='application/json',
             status_codes=['401']
         ),
+        OpenApiExample(
+            name='Already added',
+            value={'message': "game Baldur's Gate already added to favorites"},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['200']
+        ),
         OpenApiExample(
             name='Bad request',
             value={'message': 'wrong input data'},
@@ -155,14 +184,47 @@ post_favorites_api_schema = {
             media_type='application/json',
             status_codes=['400']
         ),
+        OpenApiExample(
+            name='Game not found',
+            value={'message': 'game with the id 1 does not exist'},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['404']
+        ),
     ],
     "summary": "Add favorite"
 }
 
 get_favorite_api_schema = {
     "request": GetFavoritesSerializer,
+    "parameters": [
+        OpenApiParameter(
+            name='pagination',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='cursor włącza paginację kursorem (odpowiedź count/next/previous/results, count ma wartość null)',
+            required=False,
+            enum=['cursor']
+        ),
+        OpenApiParameter(
+            name='cursor',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Kursor zwrócony w polach next/previous',
+            required=False
+        ),
+        OpenApiParameter(
+            name='page_size',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='Liczba ulubionych na stronie (domyślnie 25, maksymalnie 100)',
+            required=False
+        ),
+        *favorite_fields_parameters
+    ],
     "responses": {
         200: GetFavoritesSerializer,
+        400: DummyResponseSerializer,
         401: DummyResponseSerializer,
         404: DummyResponseSerializer,
     },
@@ -218,4 +280,48 @@ get_favorite_api_schema = {
         )
     ],
     "summary": "Get favorites"
-}
\ No newline at end of file
+}
+
+favorites_batch_api_schema = {
+    "request": FavoritesBatchSerializer,
+    "responses": {
+        200: DummyFavoritesBatchResponseSerializer,
+        400: DummyResponseSerializer,
+        401: DummyResponseSerializer,
+    },
+    "examples": [
+        OpenApiExample(
+            name='Batch request',
+            value={'add': [1, 2, 3], 'remove': [7]},
+            request_only=True,
+            media_type='application/json'
+        ),
+        OpenApiExample(
+            name='Success',
+            value={
+                'added': [{'id': 10, 'game': 1}, {'id': 11, 'game': 3}],
+                'already_added': [2],
+                'not_found': [],
+                'removed': [7]
+            },
+            response_only=True,
+            media_type='application/json',
+            status_codes=['200']
+        ),
+        OpenApiExample(
+            name='Bad request',
+            value={'message': 'wrong input data', 'errors': {'non_field_errors': ['a game id cannot be both added and removed']}},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['400']
+        ),
+        OpenApiExample(
+            name='Authorization failed',
+            value={'message': 'unauthorized'},
+            response_only=True,
+            media_type='application/json',
+            status_codes=['401']
+        ),
+    ],
+    "summary": "Add and remove many favorites"
+}
@@ -1,14 +1,17 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from .models import Favorites, User
-from games.serializers import GetGameSerializer
+from games.serializers import GetGameSerializer, GameValuesSerializer
+from utils.fieldsets import SparseFieldsMixin, parse_fields
+from utils.instrumentation import timed
 
 class GetUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['username']
 
-class GetFavoritesSerializer(serializers.ModelSerializer):
+class GetFavoritesSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     game = GetGameSerializer(read_only=True)
     user = GetUserSerializer(read_only=True)
 
@@ -16,11 +19,99 @@ class GetFavoritesSerializer(serializers.ModelSerializer):
         model = Favorites
         fields = ['id', 'game', 'user']
 
+    def __init__(self, *args, game_fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if game_fields is not None and 'game' in self.fields:
+            self.fields['game'] = GetGameSerializer(read_only=True, fields=game_fields)
+
+    @staticmethod
+    def project(queryset, fields, game_fields):
+        """select_related()/only() reading just the selected fields; user_id is kept for the owner check."""
+        related, columns = [], ['id', 'user']
+        if 'game' in fields:
+            related.append('game')
+            columns += ['game', *(f'game__{field}' for field in game_fields)]
+        if 'user' in fields:
+            related.append('user')
+            columns.append('user__username')
+        return queryset.select_related(*related).only(*columns)
+
+class FavoriteValuesSerializer:
+    """Read-only fast path for GetFavoritesSerializer built from a single joined .values() query."""
+    fields = ('id', 'game', 'user')
+
+    @classmethod
+    def select(cls, params):
+        """(fields, game fields) picked with ?fields= and ?game.fields=, all of them when absent."""
+        return parse_fields(params, 'fields', cls.fields) or cls.fields, GameValuesSerializer.select(params, 'game.fields')
+
+    @classmethod
+    def values(cls, queryset, fields=None, game_fields=None):
+        fields = fields or cls.fields
+        # id is always read for the cursor pagination, game__id tells a NULL game apart
+        columns = ['id']
+        if 'game' in fields:
+            columns += [f'game__{field}' for field in dict.fromkeys(('id', *(game_fields or GameValuesSerializer.fields)))]
+        if 'user' in fields:
+            columns += ['user__id', 'user__username']
+        return queryset.values(*columns)
+
+    @classmethod
+    def to_representation(cls, row, fields=None, game_fields=None):
+        fields = fields or cls.fields
+        data = {}
+        if 'id' in fields:
+            data['id'] = row['id']
+        if 'game' in fields:
+            data['game'] = GameValuesSerializer.from_related_row(row, 'game', game_fields)
+        if 'user' in fields:
+            data['user'] = None if row['user__id'] is None else {'username': row['user__username']}
+        return data
+
+    @classmethod
+    def many(cls, rows, fields=None, game_fields=None):
+        rows = list(rows)
+        with timed('serialize'):
+            return [cls.to_representation(row, fields, game_fields) for row in rows]
+
 class CreateFavoriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Favorites
         fields = ['id', 'game', 'user']
 
+class FavoritesBatchSerializer(serializers.Serializer):
+    add = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list,
+        max_length=getattr(settings, 'FAVORITES_BATCH_MAX_SIZE', 1000), help_text='game ids to add'
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list,
+        max_length=getattr(settings, 'FAVORITES_BATCH_MAX_SIZE', 1000), help_text='game ids to remove'
+    )
+
+    def validate(self, data):
+        if set(data['add']) & set(data['remove']):
+            raise serializers.ValidationError('a game id cannot be both added and removed')
+        return data
+
+class DummyFavoritesBatchAddedSerializer(serializers.Serializer):
+    id = serializers.IntegerField(help_text='favorite id')
+    game = serializers.IntegerField(help_text='game id')
+
+class DummyFavoritesBatchResponseSerializer(serializers.Serializer):
+    added = DummyFavoritesBatchAddedSerializer(many=True)
+    already_added = serializers.ListField(child=serializers.IntegerField(), help_text='game ids already in favorites')
+    not_found = serializers.ListField(child=serializers.IntegerField(), help_text='game ids that do not exist')
+    removed = serializers.ListField(child=serializers.IntegerField(), help_text='game ids removed from favorites')
+
+class ImportUserSerializer(serializers.Serializer):
+    """Row validation for the import_users command; uniqueness is checked per batch by users.imports."""
+    username = serializers.CharField(max_length=64)
+    password = serializers.CharField(trim_whitespace=False)
+    email = serializers.EmailField(max_length=255)
+    first_name = serializers.CharField(max_length=64)
+    last_name = serializers.CharField(max_length=64)
+
 class DummyAuthApiRequestSerializer(serializers.Serializer):
     username = serializers.CharField(help_text='username')
     password = serializers.CharField(help_text='password')
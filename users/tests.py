@@ -1,3 +1,429 @@
-from django.test import TestCase
+import io
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import QueryDict
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from . import imports
+from .imports import import_users
+from .models import AuthToken, Favorites, User
+from .pagination import FavoriteCursorPagination
+from .serializers import FavoriteValuesSerializer, GetFavoritesSerializer
+from games.models import Game
+from utils import authentication
+from utils.authentication import TokenCache, TokenUsageRecorder, token_cache
+from utils.streaming import iter_csv_records, iter_json_records
+from utils.testing import auth_headers, create_user
+
+
+def create_games(count):
+    return [Game.objects.create(name=f'Game {i}', studio='Studio', genre='RPG', year_released=2000 + i) for i in range(count)]
+
+
+class TokenCacheTests(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = create_user('fan')
+        self.token = AuthToken.objects.issue(self.user)
+        self.headers = {'Authorization': f'Token {self.token.key}'}
+
+    def test_cached_token_needs_no_auth_queries(self):
+        self.assertEqual(self.client.get('/users/favorites/', headers=self.headers).status_code, 200)
+        with self.assertNumQueries(1):
+            # only the favorites query itself
+            self.assertEqual(self.client.get('/users/favorites/', headers=self.headers).status_code, 200)
+        self.assertEqual(token_cache.get(self.token.key), (self.user, self.token))
+
+    def test_token_delete_invalidates(self):
+        self.client.get('/users/favorites/', headers=self.headers)
+        self.token.delete()
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertEqual(self.client.get('/users/favorites/', headers=self.headers).status_code, 401)
+
+    def test_user_save_invalidates(self):
+        self.client.get('/users/favorites/', headers=self.headers)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertEqual(self.client.get('/users/favorites/', headers=self.headers).status_code, 401)
+
+    def test_entries_expire_after_ttl(self):
+        cache = TokenCache(max_size=10, ttl=60)
+        with mock.patch.object(authentication.time, 'monotonic', return_value=1000.0):
+            cache.set(self.token.key, self.user, self.token)
+        with mock.patch.object(authentication.time, 'monotonic', return_value=1059.0):
+            self.assertEqual(cache.get(self.token.key), (self.user, self.token))
+        with mock.patch.object(authentication.time, 'monotonic', return_value=1060.0):
+            self.assertIsNone(cache.get(self.token.key))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TokenCache(max_size=2, ttl=60)
+        cache.set('a', self.user, self.token)
+        cache.set('b', self.user, self.token)
+        cache.get('a')
+        cache.set('c', self.user, self.token)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        cache.invalidate_user(self.user.pk)
+        self.assertEqual(cache.stats()['size'], 0)
+
+
+class FavoriteCursorPaginationTests(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = create_user('fan')
+        self.headers = auth_headers(self.user)
+        self.games = create_games(7)
+        for game in self.games:
+            Favorites.objects.create(user=self.user, game=game)
+        self.ids = list(Favorites.objects.order_by('id').values_list('id', flat=True))
+
+    def get(self, url):
+        response = self.client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_walks_next_and_previous_links(self):
+        pages, url = [], '/users/favorites/?pagination=cursor&page_size=3'
+        while url:
+            page = self.get(url)
+            self.assertIsNone(page['count'])
+            pages.append(page)
+            url = page['next']
+        self.assertEqual([[favorite['id'] for favorite in page['results']] for page in pages],
+                         [self.ids[:3], self.ids[3:6], self.ids[6:]])
+        self.assertIsNone(pages[0]['previous'])
+        back = self.get(pages[2]['previous'])
+        self.assertEqual([favorite['id'] for favorite in back['results']], self.ids[3:6])
+        self.assertEqual([favorite['id'] for favorite in self.get(back['previous'])['results']], self.ids[:3])
+
+    def test_page_size_is_capped(self):
+        paginator = FavoriteCursorPagination()
+        request = Request(RequestFactory().get('/users/favorites/', {'page_size': 1000}))
+        self.assertEqual(paginator.get_page_size(request), 100)
+        self.assertEqual(len(self.get('/users/favorites/?pagination=cursor&page_size=1000')['results']), 7)
+
+    def test_invalid_cursor(self):
+        for cursor in ('bogus', 'eyJvIjoibmFtZSIsInAiOlsxXX0'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f'/users/favorites/?cursor={cursor}', headers=self.headers)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'message': 'invalid cursor'})
+
+    def test_one_query_however_many_favorites(self):
+        self.get('/users/favorites/')
+        for url in ('/users/favorites/', '/users/favorites/?pagination=cursor&page_size=100'):
+            with self.subTest(url=url):
+                with self.assertNumQueries(1):
+                    self.get(url)
+                for game in create_games(5):
+                    Favorites.objects.create(user=self.user, game=game)
+                with self.assertNumQueries(1):
+                    self.get(url)
+
+
+class AsyncFavoritesApiTests(TestCase):
+    """The async views must answer with the same bytes as their sync counterparts."""
+
+    def setUp(self):
+        user = create_user('fan')
+        self.headers = auth_headers(user)
+        self.favorites = [Favorites.objects.create(user=user, game=game) for game in create_games(3)]
+        self.foreign = Favorites.objects.create(user=create_user('other'), game=self.favorites[0].game)
+
+    def test_same_bytes(self):
+        paths = ['/users/favorites/', '/users/favorites/?fields=game&game.fields=name,id',
+                 '/users/favorites/?pagination=cursor&page_size=2', '/users/favorites/?cursor=bogus',
+                 f'/users/favorites/{self.favorites[1].id}/', f'/users/favorites/{self.favorites[1].id}/?game.fields=genre',
+                 f'/users/favorites/{self.foreign.id}/', '/users/favorites/999999/']
+        for path in paths:
+            with self.subTest(path=path):
+                sync = self.client.get(path, headers=self.headers)
+                asynchronous = self.client.get(f'/async{path}', headers=self.headers)
+                self.assertEqual(asynchronous.status_code, sync.status_code)
+                self.assertEqual(asynchronous['Content-Type'], sync['Content-Type'])
+                # pagination links point back at the view that was asked
+                self.assertEqual(asynchronous.content.replace(b'/async/', b'/'), sync.content)
+
+
+class FavoriteValuesSerializerTests(TestCase):
+    """The joined values() fast path must render the same bytes as GetFavoritesSerializer."""
+
+    def setUp(self):
+        user, game = create_user('fan'), create_games(1)[0]
+        Favorites.objects.create(user=user, game=game)
+        Favorites.objects.create(user=user, game=None)
+        Favorites.objects.create(user=None, game=game)
+        Favorites.objects.create(user=None, game=None)
+
+    def test_renders_identical_bytes(self):
+        for query in ('', 'fields=game,id&game.fields=name', 'fields=user', 'fields=user,game&game.fields=genre,id'):
+            with self.subTest(query=query):
+                fields, game_fields = FavoriteValuesSerializer.select(QueryDict(query))
+                favorites = Favorites.objects.order_by('id')
+                instances = GetFavoritesSerializer.project(favorites, fields, game_fields)
+                expected = JSONRenderer().render(GetFavoritesSerializer(instances, many=True, fields=fields, game_fields=game_fields).data)
+                rows = FavoriteValuesSerializer.values(favorites, fields, game_fields)
+                self.assertEqual(JSONRenderer().render(FavoriteValuesSerializer.many(rows, fields, game_fields)), expected)
+
+
+class AuthTokenTests(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = create_user('fan')
+
+    def login(self):
+        response = self.client.post('/users/auth/', {'username': 'fan', 'password': 'secret'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['message'].removeprefix('Token ')
+
+    def test_login_reuses_unexpired_token(self):
+        key = self.login()
+        with self.assertNumQueries(2):
+            # the user and the reusable token, no insert
+            self.assertEqual(self.login(), key)
+        self.assertEqual(AuthToken.objects.filter(user=self.user).count(), 1)
+
+    def test_login_issues_new_token_near_expiry(self):
+        key = self.login()
+        AuthToken.objects.filter(key=key).update(expires=timezone.now() + timedelta(hours=1))
+        new_key = self.login()
+        self.assertNotEqual(new_key, key)
+        # the other session keeps its token until it expires
+        self.assertEqual(set(AuthToken.objects.values_list('key', flat=True)), {key, new_key})
+
+    def test_expired_cached_token_is_rejected(self):
+        token = AuthToken.objects.issue(self.user)
+        headers = {'Authorization': f'Token {token.key}'}
+        self.assertEqual(self.client.get('/users/favorites/', headers=headers).status_code, 200)
+        self.assertIsNotNone(token_cache.get(token.key))
+        with mock.patch('django.utils.timezone.now', return_value=token.expires + timedelta(seconds=1)):
+            self.assertEqual(self.client.get('/users/favorites/', headers=headers).status_code, 401)
+        self.assertIsNone(token_cache.get(token.key))
+
+    def test_last_used_is_written_in_batches(self):
+        first, second = AuthToken.objects.issue(self.user), AuthToken.objects.create(user=self.user)
+        recorder = TokenUsageRecorder(flush_interval=60)
+        with self.assertNumQueries(0):
+            recorder.record_and_flush(first.key)
+            recorder.record_and_flush(second.key)
+            recorder.record_and_flush(first.key)
+        self.assertFalse(AuthToken.objects.filter(last_used__isnull=False).exists())
+        with mock.patch.object(authentication.time, 'monotonic', return_value=recorder._last_flush + 60):
+            self.assertTrue(recorder.flush_due())
+            with self.assertNumQueries(1):
+                recorder.record_and_flush(second.key)
+        self.assertEqual(AuthToken.objects.filter(last_used__isnull=False).count(), 2)
+        self.assertFalse(recorder.flush_due())
+
+    def test_purge_expired_tokens(self):
+        kept = AuthToken.objects.issue(self.user)
+        for _ in range(3):
+            AuthToken.objects.create(user=self.user, expires=timezone.now() - timedelta(seconds=1))
+        call_command('purge_expired_tokens', batch_size=2, stdout=StringIO())
+        self.assertEqual(list(AuthToken.objects.values_list('key', flat=True)), [kept.key])
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportUsersTests(TestCase):
+
+    def record(self, username, email=None, **fields):
+        return {'username': username, 'password': 'secret', 'email': email or f'{username}@example.com',
+                'first_name': 'Test', 'last_name': 'User', **fields}
+
+    def run_import(self, records, **kwargs):
+        return import_users(((row, value, None) for row, value in enumerate(records, start=1)), workers=0, **kwargs)
+
+    def test_creates_users_with_hashed_passwords(self):
+        report = self.run_import([self.record('a'), self.record('b')], chunk_size=1)
+        self.assertEqual((report['processed'], report['created'], report['failed'], report['errors']), (2, 2, 0, []))
+        self.assertTrue(User.objects.get(username='a').check_password('secret'))
+
+    def test_duplicates_are_reported_per_row(self):
+        create_user('taken')
+        report = self.run_import([
+            self.record('taken', 'new@example.com'),
+            self.record('fresh', 'taken@example.com'),
+            self.record('twice'),
+            self.record('twice', 'other@example.com'),
+            self.record('another', 'twice@example.com'),
+            self.record('ok'),
+            self.record('bad', 'not-an-email'),
+        ])
+        self.assertEqual((report['created'], report['failed']), (2, 5))
+        self.assertEqual({error['row']: sorted(error['errors']) for error in report['errors']}, {
+            1: ['username'], 2: ['email'], 4: ['username'], 5: ['email'], 7: ['email'],
+        })
+        self.assertEqual(set(User.objects.values_list('username', flat=True)), {'taken', 'twice', 'ok'})
+
+    def test_row_by_row_after_integrity_error(self):
+        create_user('taken')
+        # a concurrent insert after the duplicate check: the batch insert fails and each row is retried
+        with mock.patch.object(imports, 'drop_duplicates', side_effect=lambda candidates, add_error: candidates):
+            report = self.run_import([self.record('one'), self.record('taken', 'elsewhere@example.com'), self.record('two')])
+        self.assertEqual((report['created'], report['failed']), (2, 1))
+        self.assertEqual(report['errors'], [{'row': 2, 'errors': {'non_field_errors': ['username or email already exists']}}])
+        self.assertEqual(User.objects.count(), 3)
+
+    def test_csv_row_with_extra_columns(self):
+        stream = io.BytesIO(
+            b'username,password,email,first_name,last_name\n'
+            b'a,secret,a@example.com,Test,User\n'
+            b'b,secret,b@example.com,Test,User,extra\n'
+            b'c,secret,c@example.com,Test,User\n'
+        )
+        report = import_users(iter_csv_records(stream), workers=0)
+        self.assertEqual((report['created'], report['failed']), (2, 1))
+        self.assertEqual(report['errors'], [{'row': 3, 'errors': {'non_field_errors': ['expected 5 values, got 6']}}])
+
+    def test_truncated_json_array_keeps_parsed_rows(self):
+        body = json.dumps([self.record('a'), self.record('b'), self.record('c')]).encode()
+        report = import_users(iter_json_records(io.BytesIO(body[:body.rindex(b'{"username": "c"') + 10])), workers=0)
+        self.assertEqual((report['processed'], report['created']), (2, 2))
+        self.assertIn('message', report)
+        self.assertEqual(set(User.objects.values_list('username', flat=True)), {'a', 'b'})
+
+
+class FavoritesManagerTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user('fan')
+        self.games = create_games(3)
+
+    def test_add_inserts_existing_games_once(self):
+        ids = [game.id for game in self.games]
+        added = Favorites.objects.add(self.user.id, [ids[0], ids[1], ids[0], 999999])
+        self.assertEqual(set(added), {ids[0], ids[1]})
+        self.assertEqual(dict(Favorites.objects.values_list('game_id', 'id')), added)
+        # adding again is a no-op that reports only the newly inserted rows
+        self.assertEqual(Favorites.objects.add(self.user.id, ids), {ids[2]: Favorites.objects.get(game_id=ids[2]).id})
+        self.assertEqual(Favorites.objects.add(self.user.id, ids), {})
+        self.assertEqual(Favorites.objects.filter(user=self.user).count(), 3)
+
+    def test_orm_fallback_matches_raw_insert(self):
+        ids = [game.id for game in self.games]
+        Favorites.objects.add(self.user.id, ids[:1])
+        added = Favorites.objects._add_with_orm(self.user.id, [ids[0], ids[1], 999999], 'default')
+        self.assertEqual(added, {ids[1]: Favorites.objects.get(game_id=ids[1]).id})
+        self.assertEqual(Favorites.objects.filter(user=self.user).count(), 2)
+
+    def test_without_insert_returning_falls_back_to_the_orm(self):
+        ids = [game.id for game in self.games]
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False), \
+                CaptureQueriesContext(connection) as queries:
+            added = Favorites.objects.add(self.user.id, [ids[0], 999999])
+        self.assertEqual(added, {ids[0]: Favorites.objects.get(game_id=ids[0]).id})
+        self.assertFalse([query for query in queries if 'RETURNING' in query['sql']])
+
+    def test_favorites_are_per_user(self):
+        other = create_user('other')
+        game_id = self.games[0].id
+        Favorites.objects.add(self.user.id, [game_id])
+        self.assertEqual(list(Favorites.objects.add(other.id, [game_id])), [game_id])
+
+    def test_remove_returns_removed_game_ids(self):
+        ids = [game.id for game in self.games]
+        Favorites.objects.add(self.user.id, ids[:2])
+        self.assertEqual(sorted(Favorites.objects.remove(self.user.id, [ids[1], ids[2]])), [ids[1]])
+        self.assertEqual(list(Favorites.objects.values_list('game_id', flat=True)), [ids[0]])
+
+
+class FavoritesApiTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user('fan')
+        self.headers = auth_headers(self.user)
+        self.games = create_games(3)
+
+    def test_post_created_then_already_added(self):
+        game = self.games[0]
+        response = self.client.post(f'/users/favorites/{game.id}/', headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {
+            'id': Favorites.objects.get(game=game).id, 'game': game.id, 'user': self.user.id,
+        })
+        response = self.client.post(f'/users/favorites/{game.id}/', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'message': f'game {game.name} already added to favorites'})
+        self.assertEqual(Favorites.objects.count(), 1)
+
+    def test_post_missing_game_is_404(self):
+        response = self.client.post('/users/favorites/999999/', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Favorites.objects.count(), 0)
+
+    def test_async_post_matches(self):
+        game = self.games[0]
+        self.assertEqual(self.client.post(f'/async/users/favorites/{game.id}/', headers=self.headers).status_code, 201)
+        self.assertEqual(self.client.post(f'/async/users/favorites/{game.id}/', headers=self.headers).status_code, 200)
+        self.assertEqual(self.client.post('/async/users/favorites/999999/', headers=self.headers).status_code, 404)
+
+    def test_batch(self):
+        ids = [game.id for game in self.games]
+        Favorites.objects.add(self.user.id, ids[:2])
+        response = self.client.post('/users/favorites/batch/', {
+            'add': [ids[0], ids[2], 999999, ids[2]], 'remove': [ids[1], 999998],
+        }, content_type='application/json', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'added': [{'id': Favorites.objects.get(game_id=ids[2]).id, 'game': ids[2]}],
+            'already_added': [ids[0]],
+            'not_found': [999999],
+            'removed': [ids[1]],
+        })
+        self.assertEqual(sorted(Favorites.objects.values_list('game_id', flat=True)), [ids[0], ids[2]])
+
+    def test_batch_rejects_same_id_in_add_and_remove(self):
+        game_id = self.games[0].id
+        response = self.client.post('/users/favorites/batch/', {'add': [game_id], 'remove': [game_id]},
+                                    content_type='application/json', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Favorites.objects.count(), 0)
+
+    def test_batch_requires_authentication(self):
+        response = self.client.post('/users/favorites/batch/', {'add': [self.games[0].id]}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+class FavoritesUniqueMigrationTests(TransactionTestCase):
+    migrate_from = [('users', '0003_authtoken')]
+    migrate_to = [('users', '0004_favorites_user_game_unique')]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_are_removed_keeping_the_oldest(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        old_apps = executor.loader.project_state(self.migrate_from).apps
+        user = old_apps.get_model('users', 'User').objects.create(
+            username='fan', password='x', email='fan@example.com', first_name='Test', last_name='User'
+        )
+        game_model = old_apps.get_model('games', 'Game')
+        first, second = (game_model.objects.create(name=name, studio='Studio', genre='RPG', year_released=2000)
+                         for name in ('One', 'Two'))
+        favorites = old_apps.get_model('users', 'Favorites').objects
+        kept = [favorites.create(user=user, game=first).id, favorites.create(user=user, game=second).id]
+        favorites.create(user=user, game=first)
+        favorites.create(user=user, game=first)
+        favorites.create(user=user, game=second)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        self.assertEqual(sorted(Favorites.objects.values_list('id', flat=True)), kept)
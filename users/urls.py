@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = 'users'
 urlpatterns = [
@@ -8,4 +8,8 @@ urlpatterns = [
     path('users/auth/register/', views.AuthApiRegistration.as_view()),
     path('users/favorites/', views.FavoriteAPI.as_view()),
     path('users/favorites/<int:id>/', views.FavoritesApi.as_view()),
+    path('users/favorites/batch/', views.FavoritesBatchApi.as_view()),
+
+    path('async/users/favorites/', async_views.AsyncFavoriteAPI.as_view()),
+    path('async/users/favorites/<int:id>/', async_views.AsyncFavoritesApi.as_view()),
 ]
\ No newline at end of file
@@ -1,23 +1,23 @@
 from django.contrib.auth.hashers import check_password
+from django.db import transaction
 from django.utils.datastructures import MultiValueDictKeyError
 from rest_framework import status
-from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema, OpenApiExample
 
-from .models import User, Favorites
-from .serializers import CreateFavoriteSerializer, GetFavoritesSerializer
+from .models import AuthToken, User, Favorites
+from .pagination import FavoriteCursorPagination
+from .serializers import FavoritesBatchSerializer, FavoriteValuesSerializer, GetFavoritesSerializer
 from games.models import Game
+from utils.instrumentation import timed
+from utils.schema import lazy_extend_schema
 from utils.utils import match_authenticated_user
-from users.schema_extensions import auth_api_schema, auth_api_registration_schema, get_favorites_api_schema, \
-    post_favorites_api_schema, get_favorite_api_schema
 
 
 class AuthApi(APIView):
 
-    @extend_schema(**auth_api_schema)
+    @lazy_extend_schema('users.schema_extensions.auth_api_schema')
     def post(self, request):
         try:
             if request.data:
@@ -26,8 +26,7 @@ class AuthApi(APIView):
                 return Response({'message': 'missing POST data'}, status=status.HTTP_401_UNAUTHORIZED)
 
             if check_password(request.data['password'], user.password):
-                Token.objects.filter(user=user).delete()
-                token = Token.objects.create(user=user)
+                token = AuthToken.objects.issue(user)
                 return Response({'message': f'Token {token.key}'})
             else:
                 return Response({'message': 'credentials not valid'}, status=status.HTTP_401_UNAUTHORIZED)
@@ -39,7 +38,7 @@ class AuthApi(APIView):
 
 class AuthApiRegistration(APIView):
 
-    @extend_schema(**auth_api_registration_schema)
+    @lazy_extend_schema('users.schema_extensions.auth_api_registration_schema')
     def post(self, request):
         try:
             if request.data:
@@ -55,62 +54,89 @@ class AuthApiRegistration(APIView):
 class FavoritesApi(APIView):
     permission_classes = (IsAuthenticated,)
 
-    @extend_schema(**get_favorites_api_schema)
+    @lazy_extend_schema('users.schema_extensions.get_favorites_api_schema')
     def get(self, request, id=None):
         # id from the request is the favorite id
         is_authenticated, user = match_authenticated_user(request)
         if is_authenticated:
             try:
-                favorite = Favorites.objects.get(pk=id)
-                if favorite.user.id == user.id:
-                    serializer = GetFavoritesSerializer(favorite)
-                    return Response(serializer.data, status=status.HTTP_200_OK)
+                fields, game_fields = FavoriteValuesSerializer.select(request.query_params)
+                favorite = GetFavoritesSerializer.project(Favorites.objects.all(), fields, game_fields).get(pk=id)
+                if favorite.user_id == user.id:
+                    with timed('serialize'):
+                        data = GetFavoritesSerializer(favorite, fields=fields, game_fields=game_fields).data
+                    return Response(data, status=status.HTTP_200_OK)
                 else:
                     return Response({'message': f'favorite with id {id} does not belong to authenticated user'}, status=status.HTTP_403_FORBIDDEN)
             except Favorites.DoesNotExist:
                 return Response({'message': 'Favorites not found'}, status=status.HTTP_404_NOT_FOUND)
+            except ValueError as e:
+                return Response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
         else:
             return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
 
-    @extend_schema(**post_favorites_api_schema)
+    @lazy_extend_schema('users.schema_extensions.post_favorites_api_schema')
     def post(self, request, id=None):
         # id from the request is the game id that should be added for the user
 
         is_authenticated, user = match_authenticated_user(request)
         if is_authenticated:
-            try:
-                game = Game.objects.get(pk=id)
-
-                favorite = Favorites.objects.filter(game=game, user=user)
-                if favorite.exists():
-                    return Response({'message': f'game {game.name} already added to favorites'})
-
-                data = {
-                    'game': game.id,
-                    'user': user.id
-                }
-                serializer = CreateFavoriteSerializer(data=data)
-                if serializer.is_valid():
-                    serializer.save()
-                    return Response(serializer.data, status=status.HTTP_201_CREATED)
-                return Response({'message': 'wrong input data'}, status=status.HTTP_400_BAD_REQUEST)
-            except MultiValueDictKeyError as e:
-                message = 'missing value for ' + e.args[0]
-                return Response({'message': message}, status=status.HTTP_400_BAD_REQUEST)
+            added = Favorites.objects.add(user.id, [id])
+            if id in added:
+                return Response({'id': added[id], 'game': id, 'user': user.id}, status=status.HTTP_201_CREATED)
+
+            game = Game.objects.filter(pk=id).only('name').first()
+            if game is None:
+                return Response({'message': f'game with the id {id} does not exist'}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'message': f'game {game.name} already added to favorites'})
+        else:
+            return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+
+class FavoritesBatchApi(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @lazy_extend_schema('users.schema_extensions.favorites_batch_api_schema')
+    def post(self, request):
+        # adds and removes many game ids for the authenticated user in one transaction
+        is_authenticated, user = match_authenticated_user(request)
+        if is_authenticated:
+            serializer = FavoritesBatchSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response({'message': 'wrong input data', 'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+            add, remove = serializer.validated_data['add'], serializer.validated_data['remove']
+
+            with transaction.atomic():
+                removed = Favorites.objects.remove(user.id, remove) if remove else []
+                added = Favorites.objects.add(user.id, add)
+            skipped = [game_id for game_id in dict.fromkeys(add) if game_id not in added]
+            existing = set(Game.objects.filter(pk__in=skipped).values_list('id', flat=True)) if skipped else set()
+
+            return Response({
+                'added': [{'id': favorite_id, 'game': game_id} for game_id, favorite_id in added.items()],
+                'already_added': [game_id for game_id in skipped if game_id in existing],
+                'not_found': [game_id for game_id in skipped if game_id not in existing],
+                'removed': removed,
+            }, status=status.HTTP_200_OK)
         else:
             return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
 
 class FavoriteAPI(APIView):
 
-    @extend_schema(**get_favorite_api_schema)
+    @lazy_extend_schema('users.schema_extensions.get_favorite_api_schema')
     def get(self, request):
         is_authenticated, user = match_authenticated_user(request)
         if is_authenticated:
             try:
-                favorites = Favorites.objects.filter(user=user)
-                serializer = GetFavoritesSerializer(favorites, many=True)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                fields, game_fields = FavoriteValuesSerializer.select(request.query_params)
+                favorites = FavoriteValuesSerializer.values(Favorites.objects.filter(user=user), fields, game_fields)
+                if FavoriteCursorPagination.is_requested(request):
+                    paginator = FavoriteCursorPagination()
+                    result_page = paginator.paginate_queryset(favorites, request)
+                    return paginator.get_paginated_response(FavoriteValuesSerializer.many(result_page, fields, game_fields))
+                return Response(FavoriteValuesSerializer.many(favorites, fields, game_fields), status=status.HTTP_200_OK)
             except Favorites.DoesNotExist:
                 return Response({'message': 'Favorites not found'}, status=status.HTTP_404_NOT_FOUND)
+            except ValueError as e:
+                return Response({'message': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
         else:
             return Response({'message': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
@@ -0,0 +1,42 @@
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from utils.authentication import CachedTokenAuthentication
+from utils.instrumentation import TimedJSONRenderer
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    """Render like DRF's JSONRenderer so async and sync endpoints return identical bytes."""
+    return HttpResponse(TimedJSONRenderer().render(data), content_type='application/json', status=status)
+
+
+class AsyncAPIView(View):
+    """
+    Minimal async counterpart of APIView: wraps the request in a DRF Request
+    (query_params, parsed data), authenticates it with the async token path and
+    turns APIExceptions into the same JSON bodies DRF's exception handler emits.
+    DRF's APIView cannot run async handlers, so this is a plain Django View.
+    """
+    authentication = CachedTokenAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+        try:
+            authenticated = await self.authentication.aauthenticate(request)
+            if authenticated is None:
+                raise exceptions.NotAuthenticated()
+            request.user, request.auth = authenticated
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            response = json_response({'detail': exc.detail}, status=exc.status_code)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response['WWW-Authenticate'] = self.authentication.authenticate_header(request)
+            return response
@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from users.models import AuthToken
+from utils.instrumentation import timed
+
+
+class TokenCache:
+    """Bounded in-process LRU cache of resolved token key -> (user, token) pairs with a TTL."""
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, token, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user, token
+
+    def set(self, key, user, token):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (user, token, time.monotonic() + self.ttl)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, key):
+        user, _, _ = self._entries.pop(key)
+        keys = self._keys_by_user.get(user.pk)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user.pk]
+
+
+token_cache = TokenCache(
+    max_size=getattr(settings, 'AUTH_TOKEN_CACHE_MAX_SIZE', 10000),
+    ttl=getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60),
+)
+
+
+class TokenUsageRecorder:
+    """
+    Collects token key -> last use time in memory and writes them with one
+    bulk UPDATE at most every flush_interval seconds, instead of a write per
+    authenticated request. Uses recorded since the last flush are lost if the
+    process dies, which only makes last_used slightly stale.
+    """
+
+    def __init__(self, flush_interval=60, batch_size=500):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, key):
+        with self._lock:
+            self._pending[key] = timezone.now()
+
+    def flush_due(self):
+        return bool(self._pending) and time.monotonic() - self._last_flush >= self.flush_interval
+
+    def record_and_flush(self, key):
+        self.record(key)
+        if self.flush_due():
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if pending:
+            AuthToken.objects.bulk_update(
+                [AuthToken(key=key, last_used=last_used) for key, last_used in pending.items()],
+                ['last_used'], batch_size=self.batch_size
+            )
+        return len(pending)
+
+
+token_usage = TokenUsageRecorder(flush_interval=getattr(settings, 'AUTH_TOKEN_LAST_USED_FLUSH_INTERVAL', 60))
+
+
+def check_token(user, token):
+    """Reject inactive users and expired tokens, dropping the cache entry of an expired token."""
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+    if token.is_expired:
+        token_cache.invalidate(token.key)
+        raise exceptions.AuthenticationFailed(_('Token expired.'))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication over expiring AuthTokens, resolved through the shared token_cache."""
+    model = AuthToken
+
+    def authenticate(self, request):
+        with timed('auth'):
+            key = self.get_token_key(request)
+            if key is None:
+                return None
+            return self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """Async counterpart of authenticate() for async views, using the async ORM on cache misses."""
+        with timed('auth'):
+            return await self._aauthenticate(request)
+
+    async def _aauthenticate(self, request):
+        key = self.get_token_key(request)
+        if key is None:
+            return None
+        cached = token_cache.get(key)
+        if cached is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related('user').aget(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            cached = token.user, token
+            check_token(*cached)
+            token_cache.set(key, *cached)
+        else:
+            check_token(*cached)
+        token_usage.record(key)
+        if token_usage.flush_due():
+            await sync_to_async(token_usage.flush)()
+        return cached
+
+    def get_token_key(self, request):
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            msg = _('Invalid token header. No credentials provided.')
+            raise exceptions.AuthenticationFailed(msg)
+        elif len(auth) > 2:
+            msg = _('Invalid token header. Token string should not contain spaces.')
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            msg = _('Invalid token header. Token string should not contain invalid characters.')
+            raise exceptions.AuthenticationFailed(msg)
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            cached = token.user, token
+            check_token(*cached)
+            token_cache.set(key, *cached)
+        else:
+            check_token(*cached)
+        token_usage.record_and_flush(key)
+        return cached
@@ -0,0 +1,77 @@
+import secrets
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed=None):
+    """Latency percentiles in milliseconds plus throughput for a list of request durations in seconds."""
+    latencies = sorted(latencies)
+    elapsed = sum(latencies) if elapsed is None else elapsed
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+@contextmanager
+def temporary_token(prefix='benchmark'):
+    """
+    Authorization header value of a throwaway user that cannot log in
+    (unusable password), deleted together with its tokens on exit.
+    """
+    from users.models import AuthToken
+
+    name = f'{prefix}-{secrets.token_hex(6)}'
+    user = get_user_model().objects.create_user(
+        username=name, password=None, email=f'{name}@example.invalid', first_name=prefix, last_name=prefix
+    )
+    try:
+        yield f'Token {AuthToken.objects.issue(user).key}'
+    finally:
+        user.delete()
+
+
+class QueryCounter:
+    """
+    Counts SQL statements on every database connection, including the ones
+    opened later by ASGI worker threads, through connection execute wrappers.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        for connection in connections.all(initialized_only=True):
+            connection.execute_wrappers.append(self)
+        connection_created.connect(self.install)
+        return self
+
+    def __exit__(self, *exc_info):
+        connection_created.disconnect(self.install)
+        for connection in connections.all(initialized_only=True):
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+    def install(self, sender, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
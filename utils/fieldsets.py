@@ -0,0 +1,26 @@
+def parse_fields(params, name, allowed):
+    """
+    Fields picked with a comma separated query parameter (?fields=id,name), in
+    the order of allowed, or None when the parameter is absent. Unknown names
+    raise ValueError, which the views turn into a 400 response.
+    """
+    value = params.get(name)
+    if value is None:
+        return None
+    requested = [field.strip() for field in value.split(',') if field.strip()]
+    if not requested:
+        raise ValueError(f'{name} must name at least one field')
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"unknown {name}: {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+    return tuple(field for field in allowed if field in requested)
+
+
+class SparseFieldsMixin:
+    """Serializer taking fields=(...) to emit only those of its declared fields."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
@@ -0,0 +1,137 @@
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger('performance')
+
+_current_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.db_queries = 0
+
+    def add(self, name, seconds):
+        self.durations[name] += seconds
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's timings, if it is sampled."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    timings = _current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add('db', time.perf_counter() - started)
+        timings.db_queries += 1
+
+
+def install_db_execute_wrapper(sender=None, connection=None, **kwargs):
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class PerformanceMiddleware:
+    """
+    Records DB query count and time, auth, serializer and renderer time for a
+    sampled share of requests (PERFORMANCE_SAMPLE_RATE) and reports them in a
+    Server-Timing header and/or one JSON log line on the 'performance' logger.
+    Unsampled requests only pay for one random() call and a context variable
+    lookup per query.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 1.0)
+        self.server_timing = getattr(settings, 'PERFORMANCE_SERVER_TIMING', True)
+        self.log = getattr(settings, 'PERFORMANCE_LOG', True)
+        # connections are per thread, so the wrapper goes on every connection as it is opened
+        connection_created.connect(install_db_execute_wrapper)
+        for connection in connections.all(initialized_only=True):
+            install_db_execute_wrapper(connection=connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        return self.report(request, response, timings, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not self.is_sampled():
+            return await self.get_response(request)
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        return self.report(request, response, timings, time.perf_counter() - started)
+
+    def is_sampled(self):
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def report(self, request, response, timings, total):
+        metrics = {name: seconds * 1000 for name, seconds in timings.durations.items()}
+        metrics['total'] = total * 1000
+        if self.server_timing:
+            entries = []
+            for name, ms in metrics.items():
+                if name == 'db':
+                    entries.append(f'db;desc="{timings.db_queries} queries";dur={ms:.2f}')
+                else:
+                    entries.append(f'{name};dur={ms:.2f}')
+            response['Server-Timing'] = ', '.join(entries)
+        if self.log:
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'db_queries': timings.db_queries,
+                **{f'{name}_ms': round(ms, 3) for name, ms in metrics.items()},
+            }))
+        return response
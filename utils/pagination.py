@@ -0,0 +1,156 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination. Pages are located with a WHERE on the ordering
+    key instead of OFFSET and no COUNT(*) is run, so every page costs the same
+    no matter how deep the client walks. Cursors are opaque base64 tokens.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 25
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    default_ordering = 'id'
+    # ordering name -> model fields; the last field must be unique
+    orderings = {
+        'id': ('id',),
+    }
+    # query parameters that filter a field of the same name by equality
+    equality_filters = ()
+
+    @classmethod
+    def is_requested(cls, request):
+        params = request.query_params
+        return params.get(cls.mode_query_param) == 'cursor' or cls.cursor_query_param in params
+
+    @classmethod
+    def key_fields(cls):
+        """Every field a cursor can be built from, so .values() rows must include them."""
+        return tuple(dict.fromkeys(field for fields in cls.orderings.values() for field in fields))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([obj async for obj in self.get_page_queryset(queryset, request)])
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            self.ordering, self.position, self.reverse = self.decode_cursor(encoded)
+        else:
+            self.ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+            if self.ordering not in self.orderings:
+                raise ValueError(f'invalid ordering {self.ordering}')
+            self.position, self.reverse = None, False
+
+        # a leading field pinned by an equality filter is constant on every page: leaving it out of
+        # the seek lets the index continue on the next field (year_released=? AND id>? instead of a run scan)
+        fields, position = self.orderings[self.ordering], self.position
+        while len(fields) > 1 and fields[0] in self.equality_filters and fields[0] in request.query_params:
+            fields, position = fields[1:], position and position[1:]
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(fields, position, self.reverse))
+        if self.reverse:
+            queryset = queryset.order_by(*[f'-{field}' for field in fields])
+        else:
+            queryset = queryset.order_by(*fields)
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        fields = self.orderings[self.ordering]
+        position = self.position
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.first_position = self.get_position(rows[0], fields) if rows else position
+        self.last_position = self.get_position(rows[-1], fields) if rows else position
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.build_link(self.encode_cursor(self.last_position, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.build_link(self.encode_cursor(self.first_position, reverse=True))
+
+    def build_link(self, cursor):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.ordering_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, position, reverse):
+        payload = {'o': self.ordering, 'p': position}
+        if reverse:
+            payload['r'] = 1
+        data = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    def decode_cursor(self, encoded):
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            ordering = payload['o']
+            position = payload['p']
+            reverse = bool(payload.get('r'))
+            if ordering not in self.orderings or len(position) != len(self.orderings[ordering]):
+                raise ValueError
+            position = [int(value) for value in position]
+        except (binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError):
+            raise ValueError('invalid cursor')
+        return ordering, position, reverse
+
+    @staticmethod
+    def get_position(obj, fields):
+        if isinstance(obj, dict):
+            return [obj[field] for field in fields]
+        return [getattr(obj, field) for field in fields]
+
+    @staticmethod
+    def keyset_filter(fields, position, reverse):
+        # (a, b) > (x, y)  <=>  a >= x AND (a > x OR b > y): unlike the plain OR expansion the
+        # leading a >= x is a range the index on the ordering can seek to
+        lookup = 'lt' if reverse else 'gt'
+        (field, value), rest = (fields[0], position[0]), (fields[1:], position[1:])
+        if not rest[0]:
+            return Q(**{f'{field}__{lookup}': value})
+        after = Q(**{f'{field}__{lookup}': value}) | KeysetPagination.keyset_filter(*rest, reverse)
+        return Q(**{f'{field}__{lookup}e': value}) & after
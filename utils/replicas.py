@@ -0,0 +1,144 @@
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+STICKY_KEY_PREFIX = 'replicas:sticky'
+
+_read_from_replicas = ContextVar('read_from_replicas', default=False)
+
+
+@contextmanager
+def use_primary():
+    """Send the reads inside the block to the primary database, e.g. right after a write."""
+    token = _read_from_replicas.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replicas.reset(token)
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_READ_REPLICAS', [])
+
+
+def reading_from_replicas():
+    """
+    True while the current request's reads may be answered by a lagging replica.
+    Such data must not be cached or validated under the current catalog version.
+    """
+    return bool(get_replicas()) and _read_from_replicas.get()
+
+
+@checks.register(checks.Tags.caches)
+def check_sticky_cache(app_configs, **kwargs):
+    # the stickiness marks must be visible to every worker, a per-process cache loses read-your-writes
+    if get_replicas() and isinstance(caches['default'], (LocMemCache, DummyCache)):
+        return [checks.Error(
+            'DATABASE_REPLICAS needs a cache shared by all workers for the read-your-writes marks.',
+            hint="Set CACHE_DIR (file based cache) or configure CACHES['default'] with a shared backend.",
+            id='replicas.E001',
+        )]
+    return []
+
+
+class ReplicaRouter:
+    """
+    Routes reads to a random DATABASE_READ_REPLICAS alias, but only while
+    ReplicaRoutingMiddleware has marked the current request as replica-safe;
+    management commands, writes, reads inside a transaction on the primary and
+    token lookups (a token issued a moment ago must authenticate) use the primary.
+    """
+    primary_only_models = {'users.authtoken'}
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if (
+            not replicas
+            or not _read_from_replicas.get()
+            or model._meta.label_lower in self.primary_only_models
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas are copies of the primary, see `manage.py sync_replicas`
+        if db in get_replicas():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe-method requests read from the replicas. After a client's write
+    (any unsafe-method request) its reads stay on the primary for
+    DATABASE_REPLICA_STICKY_SECONDS so it reads its own writes despite replica
+    lag. Clients are told apart by their Authorization header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'DATABASE_REPLICA_STICKY_SECONDS', 5)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = _read_from_replicas.set(self.reads_from_replicas(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_from_replicas.reset(token)
+        self.remember_write(request)
+        return response
+
+    async def __acall__(self, request):
+        token = _read_from_replicas.set(self.reads_from_replicas(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_from_replicas.reset(token)
+        self.remember_write(request)
+        return response
+
+    def reads_from_replicas(self, request):
+        if not get_replicas() or request.method not in SAFE_METHODS:
+            return False
+        key = self.sticky_key(request)
+        return key is None or caches['default'].get(key) is None
+
+    def remember_write(self, request):
+        if request.method in SAFE_METHODS or not get_replicas():
+            return
+        key = self.sticky_key(request)
+        if key is not None:
+            caches['default'].set(key, True, timeout=self.sticky_seconds)
+
+    @staticmethod
+    def sticky_key(request):
+        authorization = request.META.get('HTTP_AUTHORIZATION')
+        if not authorization:
+            return None
+        return f'{STICKY_KEY_PREFIX}:{hashlib.sha1(authorization.encode()).hexdigest()}'
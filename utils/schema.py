@@ -0,0 +1,177 @@
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import get_resolver
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from django.utils.module_loading import import_string
+from django.views import View
+
+SCHEMA_FORMATS = {
+    'yaml': 'application/vnd.oai.openapi',
+    'json': 'application/vnd.oai.openapi+json',
+}
+
+_lazy_schemas = []
+_lazy_schemas_lock = threading.Lock()
+
+
+def lazy_extend_schema(path):
+    """
+    @extend_schema(**<path>), where path is the dotted path of the kwargs dict
+    in a schema_extensions module. With settings.SCHEMA_LAZY the decoration is
+    only recorded and attached by attach_lazy_schemas() when a schema is built,
+    so importing the views imports neither drf_spectacular nor the examples.
+    """
+    def decorator(view_method):
+        if not getattr(settings, 'SCHEMA_LAZY', False):
+            return _extend_schema(view_method, path)
+        with _lazy_schemas_lock:
+            _lazy_schemas.append((view_method, path))
+        return view_method
+    return decorator
+
+
+def _extend_schema(view_method, path):
+    from drf_spectacular.utils import extend_schema
+
+    # on view methods extend_schema annotates the function itself and returns it
+    return extend_schema(**import_string(path))(view_method)
+
+
+def attach_lazy_schemas(urlconf=None):
+    """Apply the recorded @lazy_extend_schema decorations of every view reachable from the urlconf."""
+    get_resolver(urlconf).url_patterns  # imports the view modules
+    with _lazy_schemas_lock:
+        while _lazy_schemas:
+            _extend_schema(*_lazy_schemas.pop(0))
+
+
+def generate_schema():
+    """Render the OpenAPI schema the way SpectacularAPIView does, as {format: bytes}."""
+    # drf_spectacular and the schema decorations are only imported when the schema is built
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return {
+        'yaml': OpenApiYamlRenderer().render(schema, renderer_context={}),
+        'json': OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+class SchemaDocument:
+    def __init__(self, content, content_type):
+        self.content = content
+        self.content_type = content_type
+        self.gzipped = gzip.compress(content, compresslevel=9)
+        # a strong validator names one exact body, so each content-coding gets its own
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        self.etag = quote_etag(digest)
+        self.gzip_etag = quote_etag(f'{digest}-gzip')
+
+
+def accepts_gzip(accept_encoding):
+    """True when an Accept-Encoding header gives gzip (itself or through *) a non-zero q-value."""
+    qualities = {}
+    for coding in accept_encoding.split(','):
+        name, *params = [part.strip() for part in coding.split(';')]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name.lower()] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+class SchemaArtifact:
+    """
+    The OpenAPI schema built at most once per process. Outside DEBUG it is
+    read from the versioned files written by `manage.py build_schema` when they
+    exist, otherwise generated on first use and kept in memory.
+    """
+
+    def __init__(self):
+        self._documents = None
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return Path(getattr(settings, 'SCHEMA_ARTIFACT_DIR', settings.BASE_DIR / 'openapi'))
+
+    def paths(self):
+        version = settings.SPECTACULAR_SETTINGS.get('VERSION', '0')
+        return {schema_format: self.directory / f'openapi-{version}.{schema_format}' for schema_format in SCHEMA_FORMATS}
+
+    def get(self, schema_format):
+        if self._documents is None:
+            with self._lock:
+                if self._documents is None:
+                    self._documents = {
+                        schema_format: SchemaDocument(content, SCHEMA_FORMATS[schema_format])
+                        for schema_format, content in self.load().items()
+                    }
+        return self._documents[schema_format]
+
+    def load(self):
+        paths = self.paths()
+        if not settings.DEBUG and all(path.exists() for path in paths.values()):
+            return {schema_format: path.read_bytes() for schema_format, path in paths.items()}
+        return generate_schema()
+
+    def write(self):
+        """Generate the schema and write it as the versioned artifact files, returning their paths."""
+        paths = self.paths()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for schema_format, content in generate_schema().items():
+            paths[schema_format].write_bytes(content)
+        self.clear()
+        return list(paths.values())
+
+    def clear(self):
+        with self._lock:
+            self._documents = None
+
+
+schema_artifact = SchemaArtifact()
+
+
+class CachedSchemaView(View):
+    """
+    Serves the prebuilt OpenAPI schema from memory, with a precompressed gzip
+    body for clients accepting it and an ETag per body. YAML by default, JSON
+    for ?format=json or a JSON Accept header, like SpectacularAPIView.
+    """
+
+    def get(self, request, *args, **kwargs):
+        document = schema_artifact.get(self.negotiate_format(request))
+        gzipped = accepts_gzip(request.headers.get('Accept-Encoding', ''))
+        etag = document.gzip_etag if gzipped else document.etag
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(document.gzipped if gzipped else document.content, content_type=document.content_type)
+            if gzipped:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        response['Cache-Control'] = f"public, max-age={getattr(settings, 'SCHEMA_CACHE_MAX_AGE', 60)}"
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
+
+    @staticmethod
+    def negotiate_format(request):
+        requested = request.GET.get('format')
+        if requested in SCHEMA_FORMATS:
+            return requested
+        accept = request.headers.get('Accept', '')
+        return 'json' if 'json' in accept and 'yaml' not in accept else 'yaml'
@@ -0,0 +1,15 @@
+from drf_spectacular.generators import SchemaGenerator as SpectacularSchemaGenerator
+
+from .schema import attach_lazy_schemas
+
+
+class SchemaGenerator(SpectacularSchemaGenerator):
+    """
+    drf-spectacular's generator that first attaches the view decorations
+    deferred by @lazy_extend_schema, so /schema/, `manage.py build_schema` and
+    `manage.py spectacular` all see them.
+    """
+
+    def get_schema(self, request=None, public=False):
+        attach_lazy_schemas(self.urlconf)
+        return super().get_schema(request, public)
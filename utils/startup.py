@@ -0,0 +1,111 @@
+"""
+Worker cold-start measurements. boot() runs in a fresh interpreter started by
+the startup_profile and benchmark_startup commands, so that nothing imported
+by manage.py itself is counted.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+BOOT_CODE = 'from utils.startup import boot; boot()'
+STARTED_ENV = 'STARTUP_STARTED_AT'
+PATH_ENV = 'STARTUP_PATH'
+AUTHORIZATION_ENV = 'STARTUP_AUTHORIZATION'
+
+
+def boot():
+    """
+    Start the WSGI application like a worker does, load the urlconf, serve one
+    request and print the phase durations as JSON on stdout.
+    """
+    started = float(os.environ.get(STARTED_ENV) or time.time())
+    interpreter_ms = (time.time() - started) * 1000
+    phase_started = time.perf_counter()
+
+    import django
+    from django.conf import settings
+    django.setup(set_prefix=False)
+    setup_ms = (time.perf_counter() - phase_started) * 1000
+
+    phase_started = time.perf_counter()
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.urls import get_resolver
+    application = WSGIHandler()
+    get_resolver().url_patterns
+    application_ms = (time.perf_counter() - phase_started) * 1000
+
+    result = {
+        'interpreter_ms': interpreter_ms,
+        'setup_ms': setup_ms,
+        'application_ms': application_ms,
+    }
+    if path := os.environ.get(PATH_ENV):
+        phase_started = time.perf_counter()
+        status = serve_one(application, path, os.environ.get(AUTHORIZATION_ENV), settings.ALLOWED_HOSTS)
+        result['first_request_ms'] = (time.perf_counter() - phase_started) * 1000
+        result['status'] = status
+    result['time_to_first_request_ms'] = (time.time() - started) * 1000
+    result['modules'] = len(sys.modules)
+    result['drf_spectacular_loaded'] = 'drf_spectacular' in sys.modules
+    sys.stdout.write(json.dumps(result) + '\n')
+
+
+def serve_one(application, path, authorization, allowed_hosts):
+    from io import BytesIO
+    from wsgiref.util import setup_testing_defaults
+
+    path, _, query = path.partition('?')
+    host = next((host for host in allowed_hosts if '*' not in host and not host.startswith('.')), '127.0.0.1')
+    environ = {'PATH_INFO': path, 'QUERY_STRING': query, 'HTTP_HOST': host, 'wsgi.input': BytesIO()}
+    if authorization:
+        environ['HTTP_AUTHORIZATION'] = authorization
+    setup_testing_defaults(environ)
+    statuses = []
+    body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return int(statuses[0].split()[0])
+
+
+def run_boot(cwd, env=None, path=None, authorization=None, importtime=False):
+    """Run boot() in a new interpreter, returning its JSON result and its stderr."""
+    child_env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'myapp.settings'), **(env or {})}
+    child_env.pop(PATH_ENV, None)
+    if path:
+        child_env[PATH_ENV] = path
+    if authorization:
+        child_env[AUTHORIZATION_ENV] = authorization
+    command = [sys.executable, *(['-X', 'importtime'] if importtime else []), '-c', BOOT_CODE]
+    child_env[STARTED_ENV] = repr(time.time())
+    completed = subprocess.run(command, cwd=cwd, env=child_env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'boot failed')
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us)] from the `python -X importtime` report."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def by_package(modules):
+    """Self import time summed per top-level package, largest first."""
+    totals = defaultdict(lambda: [0, 0])
+    for name, self_us, _ in modules:
+        package = totals[name.split('.')[0]]
+        package[0] += self_us
+        package[1] += 1
+    return sorted(((name, self_us, count) for name, (self_us, count) in totals.items()), key=lambda item: -item[1])
@@ -0,0 +1,188 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+READ_SIZE = 64 * 1024
+MAX_ELEMENT_SIZE = 1024 * 1024
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/x-jsonlines')
+
+
+class StreamFormatError(ValueError):
+    """Raised when a JSON array stream cannot be parsed any further."""
+
+
+class ImportReport(dict):
+    """
+    Result of a chunked import: the given counters, then failed, the first
+    max_reported_errors error entries and a message when the stream broke off.
+    A plain dict otherwise, so it is returned as the response body as is.
+    """
+
+    def __init__(self, max_reported_errors=1000, **counters):
+        super().__init__(counters, failed=0, errors=[])
+        self.max_reported_errors = max_reported_errors
+
+    def add_error(self, row, errors):
+        self['failed'] += 1
+        if len(self['errors']) < self.max_reported_errors:
+            self['errors'].append({'row': row, 'errors': errors})
+
+    def guarded(self, records):
+        # a broken stream stops the run, the rows parsed so far are still imported
+        try:
+            yield from records
+        except StreamFormatError as e:
+            self['message'] = e.args[0]
+
+
+class TextStream:
+    """
+    Incrementally decoded text view of a binary (or text) file-like object
+    which can peek at the first non-blank character and be iterated by line.
+    """
+
+    def __init__(self, stream, encoding='utf-8'):
+        self.stream = stream
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.pending = ''
+
+    def read(self, size=READ_SIZE):
+        if self.pending:
+            data, self.pending = self.pending, ''
+            return data
+        while True:
+            chunk = self.stream.read(size)
+            if isinstance(chunk, str):
+                return chunk
+            data = self.decoder.decode(chunk or b'', final=not chunk)
+            # a multi-byte character may be split across reads, keep reading until something decodes
+            if data or not chunk:
+                return data
+
+    def peek_non_blank(self):
+        while not self.pending.strip():
+            chunk = self.read()
+            if not chunk:
+                return ''
+            self.pending += chunk
+        return self.pending.lstrip()[0]
+
+    def __iter__(self):
+        buffer = ''
+        while chunk := self.read():
+            buffer += chunk
+            *lines, buffer = buffer.split('\n')
+            yield from lines
+        if buffer:
+            yield buffer
+
+
+def iter_json_array(stream, read_size=READ_SIZE, max_element_size=MAX_ELEMENT_SIZE):
+    """
+    Yield the elements of a top level JSON array read from a file-like object,
+    keeping only the unparsed part of the current read buffer in memory.
+    """
+    if not isinstance(stream, TextStream):
+        stream = TextStream(stream)
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(read_size)
+        if not chunk:
+            eof = True
+            return
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            if buffer[position] == ',' and not started:
+                raise StreamFormatError('expected a JSON array')
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                raise StreamFormatError('unterminated JSON array')
+            fill()
+            continue
+        if not started:
+            if buffer[position] != '[':
+                raise StreamFormatError('expected a JSON array')
+            started = True
+            position += 1
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof or len(buffer) - position > max_element_size:
+                raise StreamFormatError(f'invalid JSON at offset {position}')
+            fill()
+            continue
+        # a bare number may be cut in half by the read boundary
+        if end == len(buffer) and not eof:
+            fill()
+            continue
+        position = end
+        yield value
+
+
+def iter_ndjson(stream):
+    """
+    Yield (line_number, value, error) for every non-empty line of an NDJSON
+    stream; malformed lines are reported through error instead of raising.
+    """
+    if not isinstance(stream, TextStream):
+        stream = TextStream(stream)
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield number, None, f'invalid JSON: {e.msg}'
+
+
+def iter_json_records(stream, content_type=''):
+    """
+    Yield (row_number, value, error) from either a JSON array or an NDJSON body.
+    The format follows the content type, or the first non-blank character otherwise.
+    """
+    stream = TextStream(stream)
+    if content_type.split(';')[0].strip() not in NDJSON_CONTENT_TYPES and stream.peek_non_blank() == '[':
+        for number, value in enumerate(iter_json_array(stream), start=1):
+            yield number, value, None
+    else:
+        yield from iter_ndjson(stream)
+
+
+def iter_csv_records(stream):
+    """
+    Yield (line_number, row, error) for every data row of a CSV stream with a
+    header row; rows with more values than header columns are reported through
+    error. line_number is the physical line the row ends on.
+    """
+    if not isinstance(stream, TextStream):
+        stream = TextStream(stream)
+    reader = csv.DictReader(line + '\n' for line in stream)
+    try:
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, f'expected {len(reader.fieldnames)} values, got {len(reader.fieldnames) + len(row[None])}'
+            else:
+                yield reader.line_num, row, None
+    except csv.Error as e:
+        raise StreamFormatError(f'invalid CSV at line {reader.line_num}: {e}')
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,13 @@
+"""Fixtures shared by the test modules."""
+from users.models import AuthToken, User
+
+
+def create_user(username, password='secret'):
+    return User.objects.create_user(
+        username=username, password=password, email=f'{username}@example.com', first_name='Test', last_name='User'
+    )
+
+
+def auth_headers(user):
+    """Authorization header with a token issued to user."""
+    return {'Authorization': f'Token {AuthToken.objects.issue(user).key}'}
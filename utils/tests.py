@@ -0,0 +1,103 @@
+import gzip
+import json
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from drf_spectacular.drainage import GENERATOR_STATS
+
+from .authentication import token_cache
+from .schema import accepts_gzip, schema_artifact
+from .testing import auth_headers, create_user
+
+
+@override_settings(PERFORMANCE_SAMPLE_RATE=1.0, PERFORMANCE_SERVER_TIMING=True, PERFORMANCE_LOG=True)
+class PerformanceMiddlewareTests(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.headers = auth_headers(create_user('timed'))
+
+    def test_server_timing_and_log_line(self):
+        with self.assertLogs('performance', 'INFO') as logs, CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/users/favorites/', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        entries = dict(entry.split(';', 1) for entry in response['Server-Timing'].split(', '))
+        self.assertLessEqual({'db', 'render', 'total'}, set(entries))
+        self.assertIn(f'desc="{len(queries)} queries"', entries['db'])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(
+            {key: record[key] for key in ('method', 'path', 'status', 'db_queries')},
+            {'method': 'GET', 'path': '/users/favorites/', 'status': 200, 'db_queries': len(queries)},
+        )
+
+    def test_cached_token_request_counts_only_its_queries(self):
+        self.client.get('/users/favorites/', headers=self.headers)
+        with self.assertLogs('performance', 'INFO') as logs, CaptureQueriesContext(connection) as queries:
+            self.client.get('/users/favorites/', headers=self.headers)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(json.loads(logs.records[0].getMessage())['db_queries'], 1)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0)
+    def test_unsampled_request_is_not_reported(self):
+        with self.assertNoLogs('performance', 'INFO'):
+            response = self.client.get('/users/favorites/', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+
+
+class CachedSchemaViewTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # built once for the class, without the generator's warnings about the existing views
+        schema_artifact.clear()
+        with GENERATOR_STATS.silence():
+            schema_artifact.get('yaml')
+
+    def get(self, path='/schema/', **headers):
+        response = self.client.get(path, headers=headers)
+        self.assertIn(response.status_code, (200, 304))
+        return response
+
+    def test_yaml_by_default_and_json_on_request(self):
+        response = self.get()
+        self.assertEqual(response['Content-Type'], 'application/vnd.oai.openapi')
+        self.assertTrue(response.content.startswith(b'openapi:'))
+        for response in (self.get('/schema/?format=json'), self.get(Accept='application/json')):
+            self.assertEqual(response['Content-Type'], 'application/vnd.oai.openapi+json')
+            self.assertIn('paths', json.loads(response.content))
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.get()['ETag']
+        response = self.get(If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        # the JSON document is another body with another validator
+        self.assertEqual(self.get('/schema/?format=json', If_None_Match=etag).status_code, 200)
+
+    def test_gzip_body_has_its_own_etag(self):
+        identity = self.get()
+        compressed = self.get(Accept_Encoding='br, gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), identity.content)
+        self.assertNotEqual(compressed['ETag'], identity['ETag'])
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertEqual(self.get(If_None_Match=compressed['ETag']).status_code, 200)
+        self.assertEqual(self.get(Accept_Encoding='gzip', If_None_Match=compressed['ETag']).status_code, 304)
+
+    def test_gzip_refused_with_zero_quality(self):
+        response = self.get(Accept_Encoding='gzip;q=0, identity')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertTrue(response.content.startswith(b'openapi:'))
+
+    def test_accepts_gzip(self):
+        cases = {
+            'gzip': True, 'GZIP;q=0.5': True, '*': True, 'deflate, *;q=0.1': True,
+            '': False, 'identity': False, 'gzip;q=0': False, 'gzip;q=0.0, *': False,
+            '*;q=0': False, 'gzip;q=bogus': False,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertIs(accepts_gzip(header), expected)
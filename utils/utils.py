@@ -1,16 +1,28 @@
 from rest_framework import status
-from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 
-from users.models import User
+from users.models import AuthToken, User
+from utils.authentication import token_cache, token_usage
+from utils.instrumentation import timed
 
 def match_authenticated_user(request):
+    with timed('auth'):
+        return _match_authenticated_user(request)
+
+def _match_authenticated_user(request):
     try:
         request_token = request.META['HTTP_AUTHORIZATION'][6:]
-        token = Token.objects.get(key=request_token)
-        user = User.objects.get(pk=token.user_id)
-        if token.key == request_token:
+        cached = token_cache.get(request_token)
+        if cached is None:
+            token = AuthToken.objects.select_related('user').get(key=request_token)
+            cached = token.user, token
+            if token.user.is_active and not token.is_expired:
+                token_cache.set(request_token, *cached)
+        user, token = cached
+        if token.key == request_token and not token.is_expired:
+            token_usage.record_and_flush(request_token)
             return True, user
+        token_cache.invalidate(request_token)
         return False, None
-    except (User.DoesNotExist, Token.DoesNotExist):
-        return Response({'message': 'authentication failed'}, status=status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+    except (User.DoesNotExist, AuthToken.DoesNotExist):
+        return Response({'message': 'authentication failed'}, status=status.HTTP_401_UNAUTHORIZED)